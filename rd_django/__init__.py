@@ -12,3 +12,5 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+
+default_app_config = 'rd_django.apps.RdDjangoConfig'
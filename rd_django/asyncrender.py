@@ -0,0 +1,89 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+rendering of Reddevil plugin subtrees from asyncio code
+
+The database work is done in a thread pool, so it never blocks the event
+loop. Every child subtree of the plugin is loaded and rendered in a worker
+thread of its own, concurrently with its siblings. The html is assembled in
+the order of the children.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from cms.models.pluginmodel import CMSPlugin
+
+from .emit import emit, emit_deferred, get_shell, is_deferred
+from .prefetch import prefetch_subtree
+from .streaming import plugin_context
+
+_executor = None
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'RD_ASYNC_WORKERS', 8),
+            thread_name_prefix='rd_django',
+        )
+    return _executor
+
+def _in_thread(func, *args):
+    # the worker threads handle their connections as Django does per request
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+async def run_sync(func, *args):
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(_in_thread, func, *args))
+
+def _load_root(plugin):
+    instance = plugin.get_plugin_instance()[0]
+    children = list(CMSPlugin.objects.filter(parent=plugin).order_by('position'))
+    return instance, children
+
+def _render_subtree(request, plugin):
+    # each thread renders with a context of its own
+    return emit(prefetch_subtree(plugin), plugin_context(request))
+
+def _render_deferred(plugin):
+    return emit_deferred(plugin.get_plugin_instance()[0])
+
+async def arender_plugin(request, plugin):
+    """
+    returns the html of a plugin and its children
+    """
+    instance, children = await run_sync(_load_root, plugin)
+    shell = get_shell(instance)
+    if shell is None:
+        return await run_sync(_render_subtree, request, plugin)
+    start, before, after, end = shell
+    tasks = []
+    for index, child in enumerate(children):
+        if is_deferred(instance, index):
+            tasks.append(run_sync(_render_deferred, child))
+        else:
+            tasks.append(run_sync(_render_subtree, request, child))
+    html = await asyncio.gather(*tasks)
+    return start + ''.join(before + h + after for h in html) + end
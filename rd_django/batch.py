@@ -0,0 +1,232 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+batch edits of Reddevil plugins
+
+apply_batch applies a list of changes in one transaction. Each change is a
+dict with the pk of a Reddevil plugin and either new field values, a move
+in the plugin tree, or both:
+
+    {'pk': 12, 'fields': {'xs_size': '6', 'md_offset': '2'}}
+    {'pk': 13, 'move': {'target': 20, 'pos': 'last-child'}}
+
+All plugins of the placeholders involved are locked first with select for
+update, so that concurrent batches on the same placeholders run one after
+the other and never interleave their tree path updates. On SQLite a batch
+takes the database write lock before it reads instead. The fragment cache
+invalidations of the saves are collected and done once per placeholder
+after the commit.
+"""
+
+import logging
+log = logging.getLogger(__name__)
+
+import collections
+import contextlib
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+from django.db.models import F
+from cms.models import Placeholder
+from cms.models.pluginmodel import CMSPlugin
+from cms.plugin_pool import plugin_pool
+from cms.utils.plugins import reorder_plugins
+
+from .cache import invalidate_plugins
+from .models import RD_PLUGIN_MODELS, RdGridCell, RdGridCellConstants
+
+_state = threading.local()
+
+MOVE_POSITIONS = ('first-child', 'last-child', 'left', 'right')
+CHILD_POSITIONS = ('first-child', 'last-child')
+
+
+def collect(instance):
+    """
+    records a changed plugin when a batch is collecting invalidations,
+    returns whether it did
+    """
+    pending = getattr(_state, 'pending', None)
+    if pending is None:
+        return False
+    pending[instance.placeholder_id].add(instance.pk)
+    return True
+
+@contextlib.contextmanager
+def coalesced_invalidation():
+    """
+    collects the fragment invalidations of the plugins saved in the block
+    and does them once per placeholder when the transaction commits
+    """
+    if getattr(_state, 'pending', None) is not None:
+        # nested: the outer block invalidates
+        yield _state.pending
+        return
+    _state.pending = pending = collections.defaultdict(set)
+    try:
+        yield pending
+    finally:
+        _state.pending = None
+    if getattr(settings, 'RD_FRAGMENT_CACHE_PLUGINS', None):
+        for placeholder_id, pks in pending.items():
+            transaction.on_commit(
+                lambda pks=pks: invalidate_plugins(pks))
+
+def editable_fields(model):
+    names = {f.name for f in model._meta.concrete_fields
+             if f.editable and f.model is not CMSPlugin
+             and not f.auto_created}
+    if model is RdGridCell:
+        names.update(RdGridCellConstants.SLOTS)
+    return names
+
+def _set_fields(instance, fields):
+    allowed = editable_fields(instance.__class__)
+    unknown = set(fields) - allowed
+    if unknown:
+        raise ValidationError('plugin {}: unknown fields {}'.format(
+            instance.pk, ', '.join(sorted(unknown))))
+    sizes = {value for value, label in RdGridCellConstants.SIZES}
+    for name, value in fields.items():
+        if name in RdGridCellConstants.SLOTS and value not in sizes:
+            raise ValidationError('plugin {}: invalid {} {!r}'.format(
+                instance.pk, name, value))
+        setattr(instance, name, value)
+    instance.clean_fields(exclude=[
+        f.name for f in instance._meta.fields if f.name not in fields])
+    instance.save()
+
+def parent_error(placeholder, plugin_type, parent_type, instance=None,
+                 parent=None):
+    """
+    returns why a plugin of plugin_type cannot be placed under a parent of
+    parent_type, None for the root, in a placeholder, or None when it can
+
+    The parent and child rules of the plugin classes apply, with the
+    overrides of the placeholder configuration, as adding a plugin does.
+    """
+    slot, page = placeholder.slot, placeholder.page
+    plugin_class = plugin_pool.get_plugin(plugin_type)
+    if parent_type is None:
+        if plugin_class.get_require_parent(slot, page):
+            return '{} requires a parent'.format(plugin_type)
+        return None
+    parent_class = plugin_pool.get_plugin(parent_type)
+    if not parent_class.allow_children or plugin_type not in \
+            parent_class.get_child_classes(slot, page, parent):
+        return '{} is no valid child of {}'.format(plugin_type, parent_type)
+    parent_classes = plugin_class.get_parent_classes(slot, page, instance)
+    if parent_classes and parent_type not in parent_classes:
+        return '{} is no valid parent of {}'.format(parent_type, plugin_type)
+    return None
+
+def check_parent(instance, parent):
+    """
+    raises ValidationError when instance cannot be placed under parent
+    """
+    error = parent_error(instance.placeholder, instance.plugin_type,
+        parent and parent.plugin_type, instance, parent)
+    if error:
+        raise ValidationError('plugin {}: {}'.format(instance.pk, error))
+
+def _move(instance, move, pending):
+    target = CMSPlugin.objects.filter(pk=move['target']).first()
+    if target is None:
+        raise ValidationError('plugin {}: unknown target {}'.format(
+            instance.pk, move['target']))
+    pos = move.get('pos', 'last-child')
+    if pos not in MOVE_POSITIONS:
+        raise ValidationError('plugin {}: invalid position {!r}'.format(
+            instance.pk, pos))
+    if target.placeholder_id != instance.placeholder_id or \
+            target.language != instance.language:
+        raise ValidationError(
+            'plugin {}: can only move within its placeholder'.format(
+                instance.pk))
+    if target.path.startswith(instance.path):
+        raise ValidationError('plugin {}: cannot move into itself'.format(
+            instance.pk))
+    if pos in CHILD_POSITIONS:
+        parent = target
+    else:
+        parent = CMSPlugin.objects.filter(pk=target.parent_id).first()
+    check_parent(instance, parent)
+    # the old ancestors lose a child: resolve them before the paths change
+    pending[instance.placeholder_id].update(
+        CMSPlugin.objects.filter(path__in=[
+            instance.path[:i] for i in range(
+                CMSPlugin.steplen, len(instance.path), CMSPlugin.steplen)
+        ]).values_list('pk', flat=True))
+    pending[instance.placeholder_id].add(instance.pk)
+    old_parent_id = instance.parent_id
+    instance.update(parent=parent)
+    instance.move(target, pos)
+    # the positions of the old and the new siblings follow the paths, as
+    # the move view of the cms does
+    for parent_id in {old_parent_id, parent and parent.pk}:
+        reorder_plugins(instance.placeholder, parent_id, instance.language,
+            CMSPlugin.objects.filter(
+                placeholder_id=instance.placeholder_id,
+                language=instance.language,
+                parent_id=parent_id,
+            ).order_by('path').values_list('pk', flat=True))
+
+
+def apply_batch(changes):
+    """
+    applies the changes in one transaction and returns the pks of the
+    placeholders involved; raises ValidationError, leaving the database
+    unchanged, when a change is not valid
+    """
+    pks = {change['pk'] for change in changes}
+    pks.update(change['move']['target'] for change in changes
+               if change.get('move'))
+    with transaction.atomic(), coalesced_invalidation() as pending:
+        if not connections[router.db_for_write(CMSPlugin)] \
+                .features.has_select_for_update:
+            # SQLite: write first, so the batch waits for the database
+            # write lock instead of failing on it after its reads
+            CMSPlugin.objects.filter(pk__in=pks).update(
+                position=F('position'))
+        placeholders = set(CMSPlugin.objects.filter(pk__in=pks)
+            .values_list('placeholder_id', flat=True))
+        # a move rewrites the paths of its siblings and their subtrees
+        locked = list(CMSPlugin.objects.select_for_update()
+            .filter(placeholder_id__in=placeholders)
+            .values_list('pk', 'plugin_type'))
+        types = dict(locked)
+        dirty = set()
+        for change in changes:
+            plugin_type = types.get(change['pk'])
+            if plugin_type not in RD_PLUGIN_MODELS:
+                raise ValidationError('plugin {}: not a Reddevil plugin'
+                    .format(change['pk']))
+            # reloaded for every change, earlier moves shift the paths
+            instance = RD_PLUGIN_MODELS[plugin_type].objects.get(
+                pk=change['pk'])
+            if change.get('fields'):
+                _set_fields(instance, change['fields'])
+            if change.get('move'):
+                _move(instance, change['move'], pending)
+            dirty.add((instance.placeholder_id, instance.language))
+        # the pages of the placeholders have unpublished changes
+        for placeholder_id, language in dirty:
+            Placeholder.objects.get(pk=placeholder_id).mark_as_dirty(language)
+    log.info('batch of %s changes on placeholders %s',
+        len(changes), sorted(placeholders))
+    return placeholders
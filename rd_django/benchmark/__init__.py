@@ -0,0 +1,27 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+benchmarks of the Reddevil plugins
+
+Synthetic placeholder trees are generated from the rd_django models and
+rendered against an in-memory SQLite database:
+
+    python -m rd_django.benchmark --depth 4 --fanout 5 --output run.json
+    python -m rd_django.benchmark --compare run.json --output new.json
+
+The results are saved as json, so that runs of different versions can be
+compared.
+"""
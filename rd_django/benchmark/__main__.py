@@ -0,0 +1,91 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+
+def parse_mix(text):
+    mix = {}
+    for item in text.split(','):
+        kind, weight = item.split('=')
+        mix[kind.strip()] = int(weight)
+    return mix
+
+def compare(old, new, prefix=''):
+    """
+    prints the ratio new / old of the numeric results present in both runs
+    """
+    for key, value in sorted(new.items()):
+        if key not in old:
+            continue
+        if isinstance(value, dict):
+            compare(old[key], value, prefix + key + '.')
+        elif isinstance(value, (int, float)) and old[key]:
+            print('{:<50} {:>14.2f} {:>14.2f} {:>7.2f}x'.format(
+                prefix + key, old[key], value, value / old[key]))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m rd_django.benchmark')
+    parser.add_argument('--scenario', action='append',
+        help='scenario to run, may be repeated (default: all)')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--fanout', type=int, default=4)
+    parser.add_argument('--mix', type=parse_mix,
+        help='weights of the content kinds, e.g. container=2,icon=3,box=2,tabs=1')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--output', help='json file for the results')
+    parser.add_argument('--compare', help='json file of an earlier run')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+        'rd_django.benchmark.settings')
+    import django
+    django.setup()
+    from . import generator
+    from .runner import SCENARIOS, setup_database
+
+    config = {
+        'depth': args.depth,
+        'fanout': args.fanout,
+        'mix': args.mix or generator.DEFAULT_MIX,
+        'seed': args.seed,
+        'iterations': args.iterations,
+    }
+    setup_database()
+    results = {
+        'config': config,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'scenarios': {},
+    }
+    for name in args.scenario or sorted(SCENARIOS):
+        print('running', name, file=sys.stderr)
+        results['scenarios'][name] = SCENARIOS[name](config)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f)['scenarios'], results['scenarios'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+generator of synthetic placeholder trees made of Reddevil plugins
+"""
+
+import random
+
+from cms.api import add_plugin
+
+# the kinds of content in the plugin mix, and the plugin they start with
+CONTENT = {
+    'container': 'RdGridContainerPlugin',
+    'icon': 'RdIconPlugin',
+    'box': 'RdBoxPlugin',
+    'tabs': 'RdTabGroupPlugin',
+}
+DEFAULT_MIX = {'container': 2, 'icon': 3, 'box': 2, 'tabs': 1}
+ICONS = ['home', 'search', 'settings', 'person', 'mail', 'star']
+COLORS = ['red', 'blue', 'green', 'grey', 'black']
+
+
+class TreeGenerator:
+    """
+    adds a random but reproducible plugin tree to a placeholder
+
+    depth is the number of content levels; a container counts as one level
+    although it brings a layout and cells, as a tab group brings its tabs.
+    Every container, box and tab gets fanout children.
+    """
+
+    def __init__(self, depth=3, fanout=4, mix=None, seed=0):
+        self.depth = depth
+        self.fanout = fanout
+        mix = mix or DEFAULT_MIX
+        self.kinds = list(mix)
+        self.weights = [mix[k] for k in self.kinds]
+        self.random = random.Random(seed)
+        self.count = 0
+
+    def generate(self, placeholder, language='en'):
+        """
+        returns the number of plugins added
+        """
+        self.placeholder = placeholder
+        self.language = language
+        self.count = 0
+        for i in range(self.fanout):
+            self.add_content(None, 1)
+        return self.count
+
+    def add(self, plugin_type, target, **data):
+        self.count += 1
+        return add_plugin(self.placeholder, plugin_type, self.language,
+            target=target, **data)
+
+    def add_content(self, target, level):
+        kind = 'icon'
+        if level < self.depth:
+            kind = self.random.choices(self.kinds, self.weights)[0]
+        getattr(self, 'add_' + kind)(target, level)
+
+    def add_children(self, target, level):
+        for i in range(self.fanout):
+            self.add_content(target, level + 1)
+
+    def add_container(self, target, level):
+        container = self.add('RdGridContainerPlugin', target,
+            container=self.random.choice(['fixed', 'fluid']),
+            gutter=self.random.choice(['', 'sm', 'md']))
+        layout = self.add('RdGridLayoutPlugin', container,
+            wrap=True)
+        for i in range(self.fanout):
+            size = self.random.choice(['3', '4', '6', '12'])
+            cell = self.add('RdGridCellPlugin', layout,
+                xs_size='12', md_size=size)
+            self.add_content(cell, level + 1)
+
+    def add_icon(self, target, level):
+        self.add('RdIconPlugin', target,
+            icon=self.random.choice(ICONS),
+            color=self.random.choice(COLORS),
+            size=self.random.choice(['', 'small', 'large']))
+
+    def add_box(self, target, level):
+        box = self.add('RdBoxPlugin', target,
+            boxtitle='box {}'.format(self.count),
+            boxtitlecolor=self.random.choice(COLORS))
+        self.add_children(box, level)
+
+    def add_tabs(self, target, level):
+        group = self.add('RdTabGroupPlugin', target)
+        for i in range(self.fanout):
+            tab = self.add('RdTabPlugin', group,
+                tabtitle='tab {}'.format(i + 1))
+            self.add_content(tab, level + 1)
@@ -0,0 +1,595 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+benchmark scenarios, each returns a dict of measurements
+"""
+
+import functools
+import gc
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test.utils import override_settings
+
+SCENARIOS = {}
+
+
+class count_queries:
+    """
+    counts the queries of a block; unlike CaptureQueriesContext it is not
+    limited by the 9000 queries kept in connection.queries
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.wrapper = connection.execute_wrapper(self)
+        self.wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.wrapper.__exit__(*exc)
+
+    def __len__(self):
+        return self.count
+
+def scenario(func):
+    SCENARIOS[func.__name__] = func
+    return func
+
+def setup_database():
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0, interactive=False)
+
+def make_placeholder(config):
+    """
+    returns a new placeholder filled by the TreeGenerator, with the number
+    of plugins in it
+    """
+    from cms.models import Placeholder
+    from .generator import TreeGenerator
+    placeholder = Placeholder.objects.create(slot='benchmark')
+    generator = TreeGenerator(
+        depth=config['depth'],
+        fanout=config['fanout'],
+        mix=config['mix'],
+        seed=config['seed'],
+    )
+    return placeholder, generator.generate(placeholder)
+
+def make_request():
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    request.session = {}
+    # set by the cms page middleware, the toolbar reads it
+    request.current_page = None
+    return request
+
+def render_placeholder(placeholder, request):
+    from cms.plugin_rendering import ContentRenderer
+    from django.template import Context
+    # drop the plugins loaded by a previous render
+    placeholder.__dict__.pop('_plugins_cache', None)
+    renderer = ContentRenderer(request)
+    context = Context({'request': request, 'cms_content_renderer': renderer})
+    return renderer.render_placeholder(placeholder, context, language='en')
+
+def measure(func, iterations):
+    """
+    returns renders/sec, queries, peak memory and allocated blocks per call
+    """
+    func()
+    gc.collect()
+    start = time.perf_counter()
+    for i in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    with count_queries() as queries:
+        func()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    func()
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    allocations = sum(max(stat.count_diff, 0)
+                      for stat in after.compare_to(before, 'lineno'))
+    return {
+        'per_second': iterations / elapsed,
+        'queries': len(queries),
+        'peak_memory': peak,
+        'allocations': allocations,
+    }
+
+@scenario
+def render(config):
+    """
+    renders the placeholder through the templates and with direct emit
+    """
+    placeholder, count = make_placeholder(config)
+    request = make_request()
+    results = {'plugins': count}
+    for mode, direct in (('template', False), ('direct_emit', True)):
+        with override_settings(RD_DIRECT_EMIT=direct):
+            results[mode] = measure(
+                lambda: render_placeholder(placeholder, request),
+                config['iterations'])
+    return results
+
+def measure_once(func):
+    """
+    returns the duration and the number of queries of a single call
+    """
+    with count_queries() as queries:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'queries': len(queries)}
+
+@scenario
+def bulk_copy(config):
+    """
+    copies the placeholder with the cms copy_plugins_to and with
+    rd_django.bulk, e.g. --depth 4 --fanout 10 gives about 5,000 plugins
+    """
+    from cms.models import Placeholder
+    from cms.utils.copy_plugins import copy_plugins_to
+    from rd_django.bulk import bulk_copy_placeholder
+    placeholder, count = make_placeholder(config)
+    plugins = list(placeholder.get_plugins('en'))
+    return {
+        'plugins': count,
+        'cms': measure_once(lambda: copy_plugins_to(
+            plugins, Placeholder.objects.create(slot='copy'), 'en')),
+        'bulk': measure_once(lambda: bulk_copy_placeholder(
+            placeholder, Placeholder.objects.create(slot='copy'), 'en')),
+    }
+
+@scenario
+def structure_board(config):
+    """
+    the short descriptions of all plugins of a placeholder, as the structure
+    board shows them, e.g. --depth 4 --fanout 10 gives about 5,000 plugins
+    """
+    from rd_django.prefetch import build_tree, prefetch_plugins
+    placeholder, count = make_placeholder(config)
+
+    def describe():
+        plugins = prefetch_plugins(placeholder, 'en')
+        # the layouts check their rows on the prefetched children
+        build_tree(plugins)
+        for plugin in plugins:
+            plugin.get_short_description()
+            plugin.get_short_description()
+
+    return {
+        'plugins': count,
+        'describe': measure(describe, config['iterations']),
+    }
+
+@scenario
+def serialization(config):
+    """
+    exports the placeholder as json lines and imports it again, e.g.
+    --depth 6 --fanout 6 gives about 12,000 plugins
+    """
+    from cms.models import Placeholder
+    from rd_django.serialization import import_placeholder, iter_export
+    placeholder, count = make_placeholder(config)
+    lines = []
+    export = measure_once(
+        lambda: lines.extend(iter_export(placeholder, 'en')))
+    target = Placeholder.objects.create(slot='import')
+    imported = measure_once(lambda: import_placeholder(lines, target))
+    for result in (export, imported):
+        result['plugins_per_second'] = count / result['seconds']
+    return {
+        'plugins': count,
+        'bytes': sum(len(line) for line in lines),
+        'export': export,
+        'import': imported,
+    }
+
+def _original_classes(cell):
+    # the class strings as RdGridCellPlugin.render computed them before the
+    # sizes and offsets were packed in RdGridCell.breakpoints
+    from rd_django.models import RdGridCellConstants
+    cells = []
+    offsets = []
+    for d in RdGridCellConstants.DISPLAYS:
+        fieldsize = getattr(cell, '{}_size'.format(d))
+        if fieldsize:
+            cells.append('{}{}'.format(d, fieldsize))
+        fieldoffset = getattr(cell, '{}_offset'.format(d))
+        if fieldoffset:
+            offsets.append('offset-{}{}'.format(d, fieldoffset))
+    return ' '.join(cells), ' '.join(offsets)
+
+@functools.lru_cache(maxsize=None)
+def cell_models():
+    """
+    returns two models holding the sizes and offsets of a cell: in the
+    string columns RdGridCell had before, and packed in one integer column
+    """
+    from django.db import models
+    from rd_django.models import RdGridCellConstants
+
+    def model(name, fields):
+        meta = type('Meta', (), {
+            'app_label': 'rd_django',
+            'db_table': 'rd_benchmark_{}'.format(name.lower()),
+        })
+        return type(name, (models.Model,),
+                    dict(fields, Meta=meta, __module__=__name__))
+
+    strings = model('StringCell', {
+        name: models.CharField(choices=RdGridCellConstants.SIZES,
+                               default='', blank=True, max_length=2)
+        for name in RdGridCellConstants.SLOTS
+    })
+    packed = model('PackedCell', {
+        'breakpoints': models.BigIntegerField(default=0),
+    })
+    return strings, packed
+
+def random_breakpoints(rnd):
+    """
+    returns random size and offset strings of a cell, in the order of
+    RdGridCellConstants.SLOTS
+    """
+    sizes = ['', '3', '4', '6', '12']
+    offsets = ['', '', '', '1', '2']
+    return [rnd.choice(sizes) for i in range(5)] + \
+        [rnd.choice(offsets) for i in range(5)]
+
+def table_bytes(table):
+    """
+    returns the bytes used by a table, None when the database does not tell
+    """
+    from django.db import DatabaseError
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            try:
+                # needs an sqlite built with SQLITE_ENABLE_DBSTAT_VTAB
+                cursor.execute(
+                    'SELECT SUM(pgsize) FROM dbstat WHERE name = %s', [table])
+            except DatabaseError:
+                return None
+        elif connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_table_size(%s)', [table])
+        else:
+            return None
+        return cursor.fetchone()[0]
+
+@scenario
+def cell_classes(config):
+    """
+    the class strings of the cells of a layout of 1,000 random cells, with
+    the original per field lookups on the string columns and decoded from
+    the packed breakpoints, computed and from the cache
+    """
+    import random
+    from cms.api import add_plugin
+    from cms.models import Placeholder
+    from rd_django.models import (RdGridCell, RdGridCellConstants,
+        decode_classes, unpack_breakpoints)
+    rnd = random.Random(config['seed'])
+    placeholder = Placeholder.objects.create(slot='benchmark')
+    container = add_plugin(placeholder, 'RdGridContainerPlugin', 'en')
+    layout = add_plugin(placeholder, 'RdGridLayoutPlugin', 'en',
+        target=container)
+    for i in range(1000):
+        add_plugin(placeholder, 'RdGridCellPlugin', 'en', target=layout,
+            **dict(zip(RdGridCellConstants.SLOTS, random_breakpoints(rnd))))
+    cells = list(RdGridCell.objects.filter(placeholder=placeholder))
+    # the same cells as they were stored before
+    StringCell = cell_models()[0]
+    originals = [
+        StringCell(**dict(zip(RdGridCellConstants.SLOTS,
+                              unpack_breakpoints(cell.breakpoints))))
+        for cell in cells
+    ]
+    assert [_original_classes(c) for c in originals] == \
+        [c.get_classes() for c in cells]
+
+    def original():
+        for cell in originals:
+            _original_classes(cell)
+
+    def decoded():
+        decode_classes.cache_clear()
+        for cell in cells:
+            cell.get_classes()
+
+    def cached():
+        for cell in cells:
+            cell.get_classes()
+
+    return {
+        'cells': len(cells),
+        'original': measure(original, config['iterations']),
+        'decoded': measure(decoded, config['iterations']),
+        'cached': measure(cached, config['iterations']),
+    }
+
+@scenario
+def cell_storage(config):
+    """
+    the size of 10,000 random cells in the string columns and packed in an
+    integer column, and the time to load them and compute their classes
+    """
+    import random
+    from rd_django.models import (RdGridCellConstants, decode_classes,
+        pack_breakpoints)
+    rnd = random.Random(config['seed'])
+    values = [random_breakpoints(rnd) for i in range(10000)]
+    StringCell, PackedCell = cell_models()
+    with connection.schema_editor() as editor:
+        editor.create_model(StringCell)
+        editor.create_model(PackedCell)
+    try:
+        StringCell.objects.bulk_create(
+            StringCell(**dict(zip(RdGridCellConstants.SLOTS, v)))
+            for v in values)
+        PackedCell.objects.bulk_create(
+            PackedCell(breakpoints=pack_breakpoints(v)) for v in values)
+
+        def strings():
+            for cell in StringCell.objects.all():
+                _original_classes(cell)
+
+        def packed():
+            decode_classes.cache_clear()
+            for cell in PackedCell.objects.all():
+                decode_classes(cell.breakpoints)
+
+        results = {'cells': len(values)}
+        for name, model, func in (('strings', StringCell, strings),
+                                  ('packed', PackedCell, packed)):
+            size = table_bytes(model._meta.db_table)
+            results[name] = {
+                'table_bytes': size,
+                'row_bytes': size / len(values) if size else None,
+                'load_classes': measure(func, config['iterations']),
+            }
+        return results
+    finally:
+        with connection.schema_editor() as editor:
+            editor.delete_model(StringCell)
+            editor.delete_model(PackedCell)
+
+def _original_template_settings(request):
+    # the tamplate_settings context processor before it was memoized
+    from django.conf import settings
+    if not hasattr(settings, 'TEMPLATE_SETTINGS'):
+        return {}
+    ts = settings.TEMPLATE_SETTINGS
+    return {k:getattr(settings,k,None) for k in ts}
+
+@scenario
+def template_settings(config):
+    """
+    the tamplate_settings context processor over 100,000 requests, as it
+    was and memoized
+    """
+    from rd_django.context_processor import tamplate_settings
+    names = ['RD_SETTING_{}'.format(i) for i in range(10)]
+    values = {name: name.lower() for name in names}
+    request = make_request()
+    results = {}
+    with override_settings(TEMPLATE_SETTINGS=names, **values):
+        for mode, processor in (('original', _original_template_settings),
+                                ('memoized', tamplate_settings)):
+            assert processor(request) == values
+
+            def requests():
+                for i in range(100000):
+                    processor(request)
+
+            results[mode] = measure_once(requests)
+    return results
+
+@scenario
+def layout(config):
+    """
+    row packing of layouts of 1,000 and 10,000 random cells, computed and
+    from the cache
+    """
+    import random
+    from rd_django.layout import pack_rows
+    rnd = random.Random(config['seed'])
+    results = {}
+    for count in (1000, 10000):
+        cells = tuple(rnd.getrandbits(40) for i in range(count))
+
+        def compute():
+            pack_rows.cache_clear()
+            pack_rows(cells)
+
+        results[str(count)] = {
+            'computed': measure(compute, config['iterations']),
+            'cached': measure(lambda: pack_rows(cells), config['iterations']),
+        }
+    return results
+
+@scenario
+def find_usages(config):
+    """
+    the placeholders using a field value of the indexed fields, e.g.
+    --depth 6 --fanout 7 gives about 30,000 plugins
+    """
+    from rd_django.models import RdBox, RdGridContainer, RdIcon
+    from rd_django.pages import find_usages as find
+    placeholder, count = make_placeholder(config)
+    results = {'plugins': count}
+    for model, field, value in ((RdIcon, 'icon', 'home'),
+                                (RdBox, 'boxtitlecolor', 'red'),
+                                (RdGridContainer, 'gutter', 'md')):
+        results['{}.{}'.format(model.__name__, field)] = measure_once(
+            lambda: find(model, field, value))
+    return results
+
+def dom_tokens(html):
+    """
+    the start tags with their attributes, the end tags and the text of a
+    document as the browser renders it: the whitespace collapsed, and
+    dropped next to the tags of rd_django.minify.BLOCK_TAGS
+    """
+    from html.parser import HTMLParser
+    from rd_django.minify import BLOCK_TAGS
+    tokens = []
+
+    class Parser(HTMLParser):
+        def handle_starttag(self, tag, attrs):
+            tokens.append(('start', tag, tuple(
+                (name, ' '.join(value.split()) if value else value)
+                for name, value in attrs)))
+
+        def handle_endtag(self, tag):
+            tokens.append(('end', tag))
+
+        def handle_data(self, data):
+            text = ' '.join(data.split())
+            if data[:1].isspace():
+                text = ' ' + text
+            if data[-1:].isspace() and text != ' ':
+                text += ' '
+            if tokens and tokens[-1][0] == 'text':
+                text = tokens.pop()[1] + text
+            tokens.append(('text', text.replace('  ', ' ')))
+
+    parser = Parser()
+    parser.feed(html)
+    parser.close()
+
+    def is_block(i):
+        return 0 <= i < len(tokens) and tokens[i][0] != 'text' and \
+            tokens[i][1] in BLOCK_TAGS
+
+    result = []
+    for i, token in enumerate(tokens):
+        if token[0] == 'text':
+            text = token[1]
+            if i == 0 or is_block(i - 1):
+                text = text.lstrip()
+            if i == len(tokens) - 1 or is_block(i + 1):
+                text = text.rstrip()
+            if not text:
+                continue
+            token = ('text', text)
+        result.append(token)
+    return result
+
+@scenario
+def minify(config):
+    """
+    the page size through the templates and the direct emitters, normal
+    and minified, e.g. --depth 4 --fanout 6 gives about 800 plugins
+    """
+    from django.conf import settings
+    placeholder, count = make_placeholder(config)
+    request = make_request()
+    templates = [dict(settings.TEMPLATES[0], APP_DIRS=False)]
+    templates[0]['OPTIONS'] = dict(templates[0]['OPTIONS'], loaders=[
+        ('django.template.loaders.cached.Loader', [
+            ('rd_django.loaders.MinifyLoader', [
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ]),
+    ])
+    modes = {
+        'template': {},
+        'template_minified': {'TEMPLATES': templates},
+        'direct_emit': {'RD_DIRECT_EMIT': True},
+        'direct_emit_minified': {'RD_DIRECT_EMIT': True, 'RD_MINIFY': True},
+    }
+    html = {}
+    results = {'plugins': count}
+    for mode, overrides in sorted(modes.items()):
+        with override_settings(**overrides):
+            html[mode] = render_placeholder(placeholder, request)
+            results[mode] = measure(
+                lambda: render_placeholder(placeholder, request),
+                config['iterations'])
+        results[mode]['bytes'] = len(html[mode].encode())
+    for mode in ('template', 'direct_emit'):
+        minified = mode + '_minified'
+        results[minified]['bytes_saved'] = \
+            results[mode]['bytes'] - results[minified]['bytes']
+        results[minified]['dom_equivalent'] = \
+            dom_tokens(html[mode]) == dom_tokens(html[minified])
+    return results
+
+@scenario
+def batch_edit(config):
+    """
+    edits all grid cells of the placeholder one save at a time and as one
+    batch, with the fragment cache on
+    """
+    from rd_django.batch import apply_batch
+    from rd_django.models import RdGridCell
+    placeholder, count = make_placeholder(config)
+    cells = list(RdGridCell.objects.filter(placeholder=placeholder))
+    results = {'plugins': count, 'changes': len(cells)}
+    with override_settings(RD_FRAGMENT_CACHE_PLUGINS=['RdGridContainerPlugin']):
+
+        def save_each():
+            for cell in cells:
+                cell.xs_size = '6'
+                cell.save()
+
+        results['single'] = measure_once(save_each)
+        results['batch'] = measure_once(lambda: apply_batch(
+            [{'pk': cell.pk, 'fields': {'xs_size': '12'}} for cell in cells]))
+    for mode in ('single', 'batch'):
+        if results[mode]['seconds']:
+            results[mode]['changes_per_second'] = \
+                len(cells) / results[mode]['seconds']
+    return results
+
+@scenario
+def stream(config):
+    """
+    time to the first chunk and to the last chunk of a streamed tab group,
+    against rendering it in one piece
+    """
+    from cms.models.pluginmodel import CMSPlugin
+    from rd_django.emit import emit
+    from rd_django.prefetch import prefetch_subtree
+    from rd_django.streaming import plugin_context, stream_plugin
+    placeholder, count = make_placeholder(dict(config, mix={'tabs': 1}))
+    group = CMSPlugin.objects.filter(placeholder=placeholder, depth=1) \
+        .order_by('path').first()
+    request = make_request()
+    results = {'plugins': count}
+    start = time.perf_counter()
+    chunks = stream_plugin(request, group)
+    next(chunks)
+    results['first_chunk_seconds'] = time.perf_counter() - start
+    for chunk in chunks:
+        pass
+    results['stream_seconds'] = time.perf_counter() - start
+    results['emit'] = measure_once(
+        lambda: emit(prefetch_subtree(group), plugin_context(request)))
+    return results
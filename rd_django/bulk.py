@@ -0,0 +1,164 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+bulk copy of plugin trees
+
+The new tree is laid out in memory: treebeard paths, depths, child counts
+and positions. It is then inserted level by level with bulk_create. The
+plugin model rows are inserted per model class. The number of queries
+depends on the depth of the tree and the number of plugin models, not on
+the number of plugins.
+"""
+
+import collections
+
+from django.db import connections, router, transaction
+from cms.models.pluginmodel import CMSPlugin
+
+from .prefetch import prefetch_plugins
+
+BATCH = 500
+
+
+def _model_fields(model):
+    # the fields of the plugin model table, without the link to CMSPlugin
+    return [f for f in model._meta.local_concrete_fields
+            if not (f.remote_field and f.remote_field.parent_link)]
+
+def _insert(model, objs, fields):
+    # bulk_create refuses multi-table inherited models, the CMSPlugin rows
+    # exist already so only the plugin model table is filled here
+    using = router.db_for_write(model)
+    connection = connections[using]
+    size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+    for i in range(0, len(objs), size):
+        model._base_manager._insert(objs[i:i + size], fields=fields,
+            using=using)
+
+def layout_tree(plugins, placeholder, language):
+    """
+    returns the new CMSPlugin rows, not saved, for the downcasted plugins
+    given in tree order, appended after the roots of the placeholder; each
+    row refers to its source plugin as rd_source
+
+    The plugins at the top depth become roots, deeper plugins whose parent
+    is not copied are left out with their subtrees, as build_tree does.
+    """
+    last = CMSPlugin.get_last_root_node()
+    laststep = last._get_lastpos_in_path() if last else 0
+    top = min(plugin.depth for plugin in plugins)
+    position = CMSPlugin.objects.filter(
+        placeholder=placeholder,
+        language=language,
+        parent=None,
+    ).count()
+    nodes = {}
+    tree = []
+    for plugin in plugins:
+        parent = nodes.get(plugin.parent_id)
+        if parent is None and plugin.depth != top:
+            continue
+        if parent is None:
+            laststep += 1
+            node = CMSPlugin(
+                path=CMSPlugin._get_path(None, 1, laststep),
+                depth=1,
+                position=position,
+            )
+            position += 1
+        else:
+            parent.numchild += 1
+            node = CMSPlugin(
+                path=CMSPlugin._get_path(
+                    parent.path, parent.depth + 1, parent.numchild),
+                depth=parent.depth + 1,
+                position=parent.numchild - 1,
+            )
+        node.plugin_type = plugin.plugin_type
+        node.placeholder = placeholder
+        node.language = language
+        node.numchild = 0
+        node.rd_parent = parent
+        node.rd_source = plugin
+        nodes[plugin.pk] = node
+        tree.append(node)
+    return tree
+
+def bulk_copy_plugins(plugins, placeholder, language):
+    """
+    copies downcasted plugins, given in tree order, to the end of a
+    placeholder, returns the new plugins in the same order
+    """
+    plugins = list(plugins)
+    if not plugins:
+        return []
+    with transaction.atomic():
+        tree = layout_tree(plugins, placeholder, language)
+        first = tree[0].path
+        levels = collections.defaultdict(list)
+        for node in tree:
+            levels[node.depth].append(node)
+        for depth in sorted(levels):
+            level = levels[depth]
+            for node in level:
+                if node.rd_parent is not None:
+                    node.parent_id = node.rd_parent.pk
+            CMSPlugin.objects.bulk_create(level, batch_size=BATCH)
+            pks = dict(CMSPlugin.objects.filter(
+                depth=depth,
+                path__gte=first,
+            ).values_list('path', 'pk'))
+            for node in level:
+                node.pk = pks[node.path]
+
+        base_fields = CMSPlugin._meta.local_concrete_fields
+        bymodel = collections.defaultdict(list)
+        copies = []
+        for node in tree:
+            plugin = node.rd_source
+            model = plugin.__class__
+            if model is CMSPlugin:
+                copies.append(node)
+                continue
+            new = model()
+            for field in base_fields:
+                setattr(new, field.attname, getattr(node, field.attname))
+            for field in _model_fields(model):
+                setattr(new, field.attname, getattr(plugin, field.attname))
+            new.cmsplugin_ptr_id = node.pk
+            bymodel[model].append(new)
+            copies.append(new)
+        for model, objs in bymodel.items():
+            _insert(model, objs, model._meta.local_concrete_fields)
+
+        # third party plugins may hold relations of their own
+        ziplist = [(new, node.rd_source) for new, node in zip(copies, tree)]
+        for new, old in ziplist:
+            if type(new).copy_relations is not CMSPlugin.copy_relations:
+                new.copy_relations(old)
+            if type(new).post_copy is not CMSPlugin.post_copy:
+                new.post_copy(old, ziplist)
+    return copies
+
+def bulk_copy_placeholder(source, target, language, target_language=None):
+    """
+    copies all plugins of a placeholder in a language to another placeholder
+    """
+    return bulk_copy_plugins(
+        prefetch_plugins(source, language),
+        target,
+        target_language or language,
+    )
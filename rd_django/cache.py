@@ -0,0 +1,116 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+fragment cache for rendered Reddevil plugin subtrees
+
+A fragment is keyed by plugin pk, tree position, language and a content
+version. The version of a plugin is replaced whenever the plugin or one of
+its descendants is saved or deleted, which makes all older fragments of
+that plugin unreachable. The structure board operations that change the
+tree without saving, like a move, replace the versions of all Reddevil
+plugins of their placeholders.
+"""
+
+import logging
+log = logging.getLogger(__name__)
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_cache():
+    return caches[getattr(settings, 'RD_FRAGMENT_CACHE_ALIAS', 'default')]
+
+def fragment_cache_enabled(plugin_type):
+    """
+    fragment caching is opt-in per plugin type via RD_FRAGMENT_CACHE_PLUGINS
+    """
+    return plugin_type in getattr(settings, 'RD_FRAGMENT_CACHE_PLUGINS', ())
+
+def _version_key(pk):
+    return 'rd_django:version:{}'.format(pk)
+
+def get_version(pk):
+    cache = get_cache()
+    key = _version_key(pk)
+    version = cache.get(key)
+    if version is None:
+        # never start from a fixed value: an evicted version must not
+        # resurrect fragments cached under an earlier one
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+def fragment_key(instance):
+    return 'rd_django:fragment:{}:{}:{}:{}:{}'.format(
+        instance.pk, instance.path, instance.position, instance.language,
+        get_version(instance.pk))
+
+def get_cached_fragment(instance):
+    return get_cache().get(fragment_key(instance))
+
+def set_cached_fragment(instance, fragment):
+    timeout = getattr(settings, 'RD_FRAGMENT_CACHE_TIMEOUT', 3600)
+    get_cache().set(fragment_key(instance), fragment, timeout)
+
+def _ancestor_paths(paths):
+    from cms.models.pluginmodel import CMSPlugin
+    steplen = CMSPlugin.steplen
+    return {path[:i] for path in paths
+            for i in range(steplen, len(path), steplen)}
+
+def _replace_versions(pks, paths):
+    """
+    replaces the version of the plugins and of the ancestors of paths
+    """
+    from cms.models.pluginmodel import CMSPlugin
+    pks = set(pks)
+    ancestors = _ancestor_paths(paths)
+    if ancestors:
+        pks.update(CMSPlugin.objects.filter(path__in=ancestors).values_list(
+            'pk', flat=True))
+    log.debug('invalidating fragments of plugins %s', sorted(pks))
+    get_cache().set_many(
+        {_version_key(pk): uuid.uuid4().hex for pk in pks}, None)
+
+def invalidate_fragments(instance):
+    """
+    replaces the version of a plugin and of all its ancestors
+    """
+    _replace_versions([instance.pk], [instance.path or ''])
+
+def invalidate_plugins(pks):
+    """
+    replaces the version of the plugins and of all their ancestors, at
+    their current place in the tree
+    """
+    from cms.models.pluginmodel import CMSPlugin
+    paths = CMSPlugin.objects.filter(pk__in=pks).values_list('path', flat=True)
+    _replace_versions(pks, paths)
+
+def invalidate_placeholders(placeholder_ids):
+    """
+    replaces the version of all the Reddevil plugins of the placeholders
+    """
+    from cms.models.pluginmodel import CMSPlugin
+    from .models import RD_PLUGIN_MODELS
+    pks = CMSPlugin.objects.filter(
+        placeholder_id__in=placeholder_ids,
+        plugin_type__in=list(RD_PLUGIN_MODELS),
+    ).values_list('pk', flat=True)
+    _replace_versions(pks, [])
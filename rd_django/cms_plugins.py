@@ -15,149 +15,264 @@
 import logging
 log = logging.getLogger(__name__)
 
-import requests
 from cms.plugin_base import CMSPluginBase
 from cms.plugin_pool import plugin_pool
 from django.conf import settings # import the settings file
-from django import forms
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
 
 from .models import (
     RdBox,
     RdGridContainer,
     RdGridLayout,
     RdGridCell,
-    RdGridCellConstants,
     RdIcon,
     RdTabGroup,
     RdTab,
 )
+from .cache import (
+    fragment_cache_enabled,
+    get_cached_fragment,
+    set_cached_fragment,
+)
+
+
+def is_edit_mode(context):
+    toolbar = getattr(context.get('request'), 'toolbar', None)
+    return bool(toolbar and toolbar.edit_mode_active)
+
+
+class RdPluginBase(CMSPluginBase):
+    """
+    common base class of the Reddevil plugins
+
+    The template variables of a plugin are returned by get_render_values.
+    When a plugin is rendered as a fragment, the fragment holds the complete
+    html of the plugin and its children and is output through
+    fragment_template instead of the plugin's own render_template.
+    """
+
+    module = 'Reddevil'
+    fragment_template = 'rd_django/fragment.html'
+
+    # the modules of the optional features are imported when they are
+    # switched on, not when the plugins are loaded
+
+    def get_render_values(self, instance):
+        values = instance.get_render_values()
+        values['ssr_class'] = ''
+        if getattr(settings, 'RD_SSR_CLASSES', False):
+            from .vuetify import ssr_class
+            values['ssr_class'] = ssr_class(self.__class__.__name__, values)
+        return values
+
+    def render(self, context, instance, placeholder):
+        context.update(self.get_render_values(instance))
+        context = super(RdPluginBase, self).render(
+            context, instance, placeholder)
+        context['rd_fragment'] = None
+        if is_edit_mode(context):
+            return context
+        if getattr(settings, 'RD_INSTRUMENTATION_SINKS', None):
+            from .instrumentation import measure
+            # render the subtree here, so the sample covers the children
+            with measure(instance):
+                fragment = self.get_fragment(context, instance, placeholder)
+                if fragment is None:
+                    fragment = self.render_fragment(
+                        context, instance, placeholder)
+        else:
+            fragment = self.get_fragment(context, instance, placeholder)
+        if fragment is not None:
+            context['rd_fragment'] = mark_safe(fragment)
+        return context
+
+    def get_fragment(self, context, instance, placeholder):
+        """
+        returns the html of the plugin subtree, or None when it is left to
+        the plugin template
+        """
+        plugin_type = self.__class__.__name__
+        request = context.get('request')
+        if plugin_type in getattr(settings, 'RD_MEMO_PLUGINS', ()) and \
+                request is not None and not instance.child_plugin_instances:
+            from .memo import get_memo, memo_key
+            memo = get_memo(request)
+            key = memo_key(plugin_type, self.get_render_values(instance))
+            fragment = memo.get(key)
+            if fragment is None:
+                fragment = self.render_fragment(context, instance, placeholder)
+                memo.set(key, fragment)
+            return fragment
+        if fragment_cache_enabled(plugin_type):
+            fragment = get_cached_fragment(instance)
+            if fragment is None:
+                fragment = self.render_fragment(context, instance, placeholder)
+                set_cached_fragment(instance, fragment)
+            return fragment
+        if getattr(settings, 'RD_DIRECT_EMIT', False):
+            return self.render_fragment(context, instance, placeholder)
+        return None
+
+    def render_fragment(self, context, instance, placeholder):
+        """
+        renders the plugin subtree, either straight from python or through
+        the plugin's own template
+        """
+        if getattr(settings, 'RD_DIRECT_EMIT', False):
+            # the emitters are only needed when direct emit is switched on
+            from .emit import emit
+            return emit(instance, context)
+        template = get_template(
+            self.get_render_template(context, instance, placeholder))
+        return template.render(context.flatten())
+
+    def get_render_template(self, context, instance, placeholder):
+        if context.get('rd_fragment') is not None:
+            return self.fragment_template
+        return self.render_template
+
+def warn_overflow(request, layout):
+    from django.contrib import messages
+    overflow = layout.check_layout().overflow
+    if overflow:
+        messages.warning(request,
+            'The cells of layout {} exceed 12 columns at {}'.format(
+                layout.pk, ', '.join(overflow)))
 
 @plugin_pool.register_plugin
-class RdGridContainerPlugin(CMSPluginBase):
+class RdGridContainerPlugin(RdPluginBase):
 
     model = RdGridContainer
     name = 'Container'
-    module = 'Reddevil'
     render_template = 'rd_django/grid_container.html'
     allow_children = True
 
-    def render(self, context, instance, placeholder):
-        context['fluid'] = ''
-        if instance.container == 'fluid':
-            context['fluid'] = 'fluid'
-        context['gutter'] = ''
-        if instance.gutter:
-            context['gutter'] = 'grid-list-{}'.format(instance.gutter)
-        return super(RdGridContainerPlugin, self).render(
-            context, instance, placeholder)
-
 @plugin_pool.register_plugin
-class RdGridLayoutPlugin(CMSPluginBase):
+class RdGridLayoutPlugin(RdPluginBase):
 
     model = RdGridLayout
     name = 'Layout'
-    module = 'Reddevil'
     render_template = 'rd_django/grid_layout.html'
     allow_children = True
     child_classes = ['RdGridCellPlugin']
 
     def render(self, context, instance, placeholder):
-        context['direction'] = 'row'
-        if instance.layout == 'vertical':
-            context['direction'] = 'column'
-        context['wrap'] = ''
-        if instance.wrap:
-            context['wrap'] = 'wrap'
+        from .layout import row_breaks
+        # row breaks per display, as hints for custom templates, of the
+        # children the template renders
+        layout = instance.check_layout(query=False)
+        context['rd_row_breaks'] = row_breaks(layout)
+        context['rd_overflow'] = layout.overflow
         return super(RdGridLayoutPlugin, self).render(
             context, instance, placeholder)
 
+    def save_model(self, request, obj, form, change):
+        super(RdGridLayoutPlugin, self).save_model(request, obj, form, change)
+        warn_overflow(request, obj)
+
 @plugin_pool.register_plugin
-class RdGridCellPlugin(CMSPluginBase):
+class RdGridCellPlugin(RdPluginBase):
 
     model = RdGridCell
     name = 'Cell'
-    module = 'Reddevil'
     render_template = 'rd_django/grid_cell.html'
     allow_children = True
     require_parent = True
     parent_classes = ['RdGridLayoutPlugin']
 
-    def render(self, context, instance, placeholder):
-        cells = []
-        offsets = []
-        for d in RdGridCellConstants.DISPLAYS:
-            fieldsize = getattr(instance, '{}_size'.format(d))
-            if fieldsize:
-                cells.append('{}{}'.format(d, fieldsize))
-            fieldoffset = getattr(instance, '{}_offset'.format(d))
-            if fieldoffset:
-                offsets.append('offset-{}{}'.format(d, fieldoffset))
-        context['cells'] = ' '.join(cells) if cells else ''
-        context['offsets'] = ' '.join(offsets) if offsets else ''
-        return super(RdGridCellPlugin, self).render(
-            context, instance, placeholder)
+    def get_form(self, request, obj=None, **kwargs):
+        from .forms import RdGridCellForm
+        kwargs.setdefault('form', RdGridCellForm)
+        return super(RdGridCellPlugin, self).get_form(request, obj, **kwargs)
+
+    def save_model(self, request, obj, form, change):
+        super(RdGridCellPlugin, self).save_model(request, obj, form, change)
+        layout = RdGridLayout.objects.filter(pk=obj.parent_id).first()
+        if layout is not None:
+            warn_overflow(request, layout)
 
 @plugin_pool.register_plugin
-class RdIconPlugin(CMSPluginBase):
+class RdIconPlugin(RdPluginBase):
 
     model = RdIcon
     name = 'Icon'
-    module = 'Reddevil'
     render_template = 'rd_django/icon.html'
     text_enabled = True
 
-    def render(self, context, instance, placeholder):
-        context['icon'] = instance.icon
-        context['size'] = instance.size
-        context['color'] = instance.color
-        context['additional_classes'] = ''
-        if instance.additional_classes:
-            context['additional_classes'] = 'class="{}"'.format(instance.additional_classes)
-        return super(RdIconPlugin, self).render(
+    sprite_template = 'rd_django/icon_sprite.html'
+
+    def get_render_values(self, instance):
+        values = super(RdIconPlugin, self).get_render_values(instance)
+        values['sprite_href'] = None
+        if getattr(settings, 'RD_ICON_SPRITE', None):
+            from .sprite import FONT_SIZES, sprite_href
+            values['sprite_href'] = sprite_href(instance.icon)
+            values['font_size'] = FONT_SIZES.get(
+                instance.size, FONT_SIZES[''])
+        return values
+
+    def get_render_template(self, context, instance, placeholder):
+        if context.get('rd_fragment') is None and context.get('sprite_href'):
+            return self.sprite_template
+        return super(RdIconPlugin, self).get_render_template(
             context, instance, placeholder)
 
 @plugin_pool.register_plugin
-class RdTabGroupPlugin(CMSPluginBase):
+class RdTabGroupPlugin(RdPluginBase):
 
     model = RdTabGroup
     name = 'Group of tabs'
-    module = 'Reddevil'
     render_template = 'rd_django/tab_group.html'
     allow_children = True
     child_classes = ['RdTabPlugin']
 
-    def render(self, context, instance, placeholder):
-        context['slidercolor'] = instance.slidercolor
-        return super(RdTabGroupPlugin, self).render(
-            context, instance, placeholder)
-
 @plugin_pool.register_plugin
-class RdTabPlugin(CMSPluginBase):
+class RdTabPlugin(RdPluginBase):
 
     model = RdTab
     name = 'Tab'
-    module = 'Reddevil'
     render_template = 'rd_django/tab.html'
     require_parent = True
     allow_children = True
 
+    deferred_template = 'rd_django/tab_deferred.html'
+
     def render(self, context, instance, placeholder):
-        context['tabtitle'] = instance.tabtitle
-        return super(RdTabPlugin, self).render(
+        # in a deferred group only the first tab is rendered, the others
+        # point to the rd_tab endpoint; editors get all tabs to edit them
+        parentloop = context.get('parentloop') or {}
+        context['rd_deferred_url'] = ''
+        if context.get('rd_tabs_deferred') and parentloop.get('counter0') \
+                and not is_edit_mode(context):
+            from django.urls import reverse
+            context['rd_deferred_url'] = reverse('rd_tab', args=[instance.pk])
+        return super(RdTabPlugin, self).render(context, instance, placeholder)
+
+    def get_fragment(self, context, instance, placeholder):
+        if context.get('rd_deferred_url'):
+            return self.render_fragment(context, instance, placeholder)
+        return super(RdTabPlugin, self).get_fragment(
+            context, instance, placeholder)
+
+    def render_fragment(self, context, instance, placeholder):
+        if context.get('rd_deferred_url'):
+            template = get_template(self.deferred_template)
+            return template.render(context.flatten())
+        return super(RdTabPlugin, self).render_fragment(
+            context, instance, placeholder)
+
+    def get_render_template(self, context, instance, placeholder):
+        if context.get('rd_fragment') is None and \
+                context.get('rd_deferred_url'):
+            return self.deferred_template
+        return super(RdTabPlugin, self).get_render_template(
             context, instance, placeholder)
 
 @plugin_pool.register_plugin
-class RdBoxPlugin(CMSPluginBase):
+class RdBoxPlugin(RdPluginBase):
 
     model = RdBox
     name = 'Box'
-    module = 'Reddevil'
     render_template = 'rd_django/box.html'
     allow_children = True
-
-    def render(self, context, instance, placeholder):
-        context['boxtitle'] = instance.boxtitle
-        context['boxtitlecolor'] = instance.boxtitlecolor or 'black'
-        context['boxbackgroundcolor'] = instance.boxbackgroundcolor or 'grey'
-        return super(RdBoxPlugin, self).render(
-            context, instance, placeholder)
\ No newline at end of file
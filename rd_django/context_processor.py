@@ -12,10 +12,27 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from types import MappingProxyType
+
 from django.conf import settings # import the settings file
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+# read-only mapping of the TEMPLATE_SETTINGS, computed once
+_template_settings = None
+
+def get_template_settings():
+    global _template_settings
+    if _template_settings is None:
+        ts = getattr(settings, 'TEMPLATE_SETTINGS', ())
+        _template_settings = MappingProxyType(
+            {k:getattr(settings,k,None) for k in ts})
+    return _template_settings
+
+@receiver(setting_changed, dispatch_uid='rd_django_template_settings')
+def reset_template_settings(**kwargs):
+    global _template_settings
+    _template_settings = None
 
 def tamplate_settings(request):
-    if not hasattr(settings, 'TEMPLATE_SETTINGS'):
-        return {}
-    ts = settings.TEMPLATE_SETTINGS
-    return {k:getattr(settings,k,None) for k in ts}
+    return get_template_settings()
@@ -0,0 +1,229 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+direct emit of the Reddevil markup
+
+The emitters build exactly the html of the templates in
+templates/rd_django, escaping the same template variables, so that a whole
+container -> layout -> cell subtree is rendered in one pass without the
+Django template engine. Children that are not Reddevil plugins are rendered
+by the cms content renderer as {% render_plugin %} would do.
+"""
+
+from django.conf import settings
+from django.utils.html import conditional_escape
+
+from .minify import minify_html, minify_markup
+
+# Each shell function returns the (start, before, after, end) strings of a
+# plugin: the html up to the children, the text around every child and the
+# html after the children.
+
+def shell_grid_container(values):
+    return (
+        '\n\n<v-container{} {}  {}>\n    '.format(
+            values.get('ssr_class', ''),
+            conditional_escape(values['fluid']),
+            conditional_escape(values['gutter'])),
+        '\n        ', '\n    ',
+        '\n</v-container>\n',
+    )
+
+def shell_grid_layout(values):
+    return (
+        '\n\n<v-layout{}  {} {}>\n    '.format(
+            values.get('ssr_class', ''),
+            conditional_escape(values['direction']),
+            conditional_escape(values['wrap'])),
+        '\n        ', '\n    ',
+        '\n</v-layout>\n',
+    )
+
+def shell_grid_cell(values):
+    return (
+        '\n\n<v-flex{} {} {}>\n    '.format(
+            values.get('ssr_class', ''),
+            conditional_escape(values['cells']),
+            conditional_escape(values['offsets'])),
+        '\n        ', '\n    ',
+        '\n</v-flex>',
+    )
+
+def shell_icon(values):
+    if values.get('sprite_href'):
+        classes = 'v-icon rd-icon'
+        if values['color']:
+            classes += ' {}--text'.format(conditional_escape(values['color']))
+        if values['class_names']:
+            classes += ' {}'.format(conditional_escape(values['class_names']))
+        return (
+            ('\n\n<svg class="{}" width="1em" '
+             'height="1em" style="font-size:{}" fill="currentColor" '
+             'aria-hidden="true"><use href="{}"></use></svg>\n').format(
+                classes,
+                conditional_escape(values['font_size']),
+                conditional_escape(values['sprite_href'])),
+            '', '',
+            '',
+        )
+    return (
+        '\n\n<v-icon color="{}" {}  {}>{}</v-icon>\n'.format(
+            conditional_escape(values['color']),
+            conditional_escape(values['size']),
+            values['additional_classes'],
+            conditional_escape(values['icon'])),
+        '', '',
+        '',
+    )
+
+def shell_tab_group(values):
+    return (
+        '\n\n<v-tabs{} slider-color="{}" v-model="tabactive">\n  '.format(
+            values.get('ssr_class', ''),
+            conditional_escape(values['slidercolor'])),
+        '\n    ', '\n  ',
+        '\n</v-tabs>\n\n\n',
+    )
+
+def shell_tab(values):
+    return (
+        '\n\n\n<v-tab>\n  {}\n</v-tab>\n<v-tab-item>\n  '.format(
+            conditional_escape(values['tabtitle'])),
+        '\n    ', '\n  ',
+        '\n</v-tab-item>\n\n\n',
+    )
+
+def emit_deferred_tab(values, url):
+    return ('\n\n\n<v-tab>\n  {}\n</v-tab>\n<v-tab-item>\n'
+            '  <div data-rd-tab-src="{}"></div>\n</v-tab-item>\n\n\n').format(
+        conditional_escape(values['tabtitle']),
+        conditional_escape(url),
+    )
+
+def shell_box(values):
+    return (
+        ('\n\n<v-card{}>\n  <v-card-title class="{}">\n'
+         '    <h4 class="{}--text">{}</h4>\n  </v-card-title>\n'
+         '  <v-card-text>\n    ').format(
+            values.get('ssr_class') or ' class="my-2"',
+            conditional_escape(values['boxbackgroundcolor']),
+            conditional_escape(values['boxtitlecolor']),
+            conditional_escape(values['boxtitle'])),
+        '\n        ', '\n    ',
+        '\n  </v-card-text>\n</v-card>',
+    )
+
+SHELLS = {
+    'RdGridContainerPlugin': shell_grid_container,
+    'RdGridLayoutPlugin': shell_grid_layout,
+    'RdGridCellPlugin': shell_grid_cell,
+    'RdIconPlugin': shell_icon,
+    'RdTabGroupPlugin': shell_tab_group,
+    'RdTabPlugin': shell_tab,
+    'RdBoxPlugin': shell_box,
+}
+
+# plugin class instances, one per plugin type
+_plugins = {}
+
+def get_plugin(instance):
+    plugin = _plugins.get(instance.plugin_type)
+    if plugin is None:
+        plugin = _plugins[instance.plugin_type] = \
+            instance.get_plugin_class_instance()
+    return plugin
+
+def get_shell(instance):
+    shell = SHELLS.get(instance.plugin_type)
+    if shell is None:
+        return None
+    shell = shell(get_plugin(instance).get_render_values(instance))
+    if getattr(settings, 'RD_MINIFY', False):
+        return tuple(minify_markup(part) for part in shell)
+    return shell
+
+# the templates the emitters stand in for
+PLUGIN_TEMPLATES = ('render_template', 'sprite_template', 'deferred_template')
+
+def _subtree(instance):
+    yield instance
+    for child in getattr(instance, 'child_plugin_instances', None) or ():
+        yield from _subtree(child)
+
+def has_overrides(instances):
+    """
+    whether the project overrides the template of a Reddevil plugin in the
+    subtrees of prefetched instances, which the emitters would not follow
+    """
+    from .loaders import is_overridden
+    classes = {i.plugin_type: i.get_plugin_class()
+               for instance in instances for i in _subtree(instance)
+               if i.plugin_type in SHELLS}
+    return any(is_overridden(getattr(plugin_class, name))
+               for plugin_class in classes.values()
+               for name in PLUGIN_TEMPLATES
+               if getattr(plugin_class, name, None))
+
+def render_foreign(instance, context):
+    return context['cms_content_renderer'].render_plugin(
+        instance, context, placeholder=instance.placeholder)
+
+def is_deferred(parent, index):
+    """
+    whether the child at index of parent is loaded on demand
+    """
+    return index > 0 and parent.plugin_type == 'RdTabGroupPlugin' and \
+        parent.deferred
+
+def emit_deferred(instance):
+    from django.urls import reverse
+    html = emit_deferred_tab(
+        get_plugin(instance).get_render_values(instance),
+        reverse('rd_tab', args=[instance.pk]),
+    )
+    if getattr(settings, 'RD_MINIFY', False):
+        return minify_markup(html)
+    return html
+
+def iter_emit(instance, context):
+    """
+    yields the html of a plugin and its children piece by piece
+    """
+    shell = get_shell(instance)
+    if shell is None:
+        yield render_foreign(instance, context)
+        return
+    start, before, after, end = shell
+    yield start
+    for index, child in enumerate(instance.child_plugin_instances or ()):
+        yield before
+        if is_deferred(instance, index):
+            yield emit_deferred(child)
+        else:
+            yield from iter_emit(child, context)
+        yield after
+    yield end
+
+def emit(instance, context):
+    """
+    returns the html of a plugin and its children
+    """
+    html = ''.join(iter_emit(instance, context))
+    if getattr(settings, 'RD_MINIFY', False):
+        # the pieces are minified on their own, the whitespace where they
+        # meet is left to a pass over the whole
+        return minify_html(html)
+    return html
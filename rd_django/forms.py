@@ -0,0 +1,56 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django import forms
+
+from .models import RdGridCell, RdGridCellConstants
+
+
+def _slot_field(label):
+    return forms.ChoiceField(
+        label=label,
+        choices=RdGridCellConstants.SIZES,
+        required=False,
+    )
+
+class RdGridCellForm(forms.ModelForm):
+    """
+    edits the sizes and offsets packed in RdGridCell.breakpoints
+    """
+
+    xs_size = _slot_field('width cell for extra small display')
+    sm_size = _slot_field('width cell for small display')
+    md_size = _slot_field('width cell medium display')
+    lg_size = _slot_field('width cell large display')
+    xl_size = _slot_field('width cell extra large display')
+    xs_offset = _slot_field('offset for extra small display')
+    sm_offset = _slot_field('offset for small display')
+    md_offset = _slot_field('offset medium display')
+    lg_offset = _slot_field('offset large display')
+    xl_offset = _slot_field('offset extra large display')
+
+    class Meta:
+        model = RdGridCell
+        fields = []
+
+    def __init__(self, *args, **kwargs):
+        super(RdGridCellForm, self).__init__(*args, **kwargs)
+        for slot in RdGridCellConstants.SLOTS:
+            self.initial.setdefault(slot, getattr(self.instance, slot))
+
+    def save(self, commit=True):
+        for slot in RdGridCellConstants.SLOTS:
+            setattr(self.instance, slot, self.cleaned_data[slot])
+        return super(RdGridCellForm, self).save(commit)
@@ -0,0 +1,192 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+render-time instrumentation of the Reddevil plugins
+
+Instrumentation is switched on by listing sink classes in
+RD_INSTRUMENTATION_SINKS. Every Reddevil plugin render then produces a
+RenderSample, passed to each sink. Durations and query counts include the
+children of the plugin.
+"""
+
+import logging
+log = logging.getLogger(__name__)
+
+import collections
+import contextlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connection
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+RenderSample = collections.namedtuple('RenderSample', [
+    'plugin_type', 'pk', 'duration', 'depth', 'children', 'queries'])
+
+_sinks = None
+
+def get_sinks():
+    global _sinks
+    if _sinks is None:
+        _sinks = [import_string(path)() for path in
+                  getattr(settings, 'RD_INSTRUMENTATION_SINKS', ())]
+    return _sinks
+
+@receiver(setting_changed, dispatch_uid='rd_django_instrumentation')
+def reset_sinks(setting, **kwargs):
+    global _sinks
+    if setting == 'RD_INSTRUMENTATION_SINKS':
+        _sinks = None
+
+def get_sink(cls):
+    """
+    returns the first configured sink of a class
+    """
+    for sink in get_sinks():
+        if isinstance(sink, cls):
+            return sink
+
+class _QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+@contextlib.contextmanager
+def measure(instance):
+    """
+    records a RenderSample for the code run inside the context
+    """
+    counter = _QueryCounter()
+    start = time.perf_counter()
+    with connection.execute_wrapper(counter):
+        yield
+    sample = RenderSample(
+        plugin_type=instance.plugin_type,
+        pk=instance.pk,
+        duration=time.perf_counter() - start,
+        depth=instance.depth,
+        children=len(getattr(instance, 'child_plugin_instances', None) or ()),
+        queries=counter.count,
+    )
+    for sink in get_sinks():
+        sink.record(sample)
+
+def percentile(ordered, p):
+    """
+    nearest-rank percentile of a sorted list
+    """
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(len(ordered) * p / 100) - 1)]
+
+
+class LoggingSink:
+    """
+    logs every sample on the rd_django.instrumentation logger
+    """
+
+    def record(self, sample):
+        log.info('%s %s: %.3f ms, depth %s, %s children, %s queries',
+            sample.plugin_type, sample.pk, sample.duration * 1000,
+            sample.depth, sample.children, sample.queries)
+
+class RingBufferSink:
+    """
+    keeps the last RD_INSTRUMENTATION_BUFFER samples in memory
+    """
+
+    def __init__(self):
+        self.samples = collections.deque(
+            maxlen=getattr(settings, 'RD_INSTRUMENTATION_BUFFER', 10000))
+
+    def record(self, sample):
+        self.samples.append(sample)
+
+    def stats(self):
+        """
+        returns per plugin type the call count, the cumulative and
+        p50/p95/p99 render time, the max depth, the mean number of children
+        and the total number of queries of the buffered samples
+        """
+        bytype = collections.defaultdict(list)
+        for sample in list(self.samples):
+            bytype[sample.plugin_type].append(sample)
+        stats = {}
+        for plugin_type, samples in bytype.items():
+            durations = sorted(s.duration for s in samples)
+            stats[plugin_type] = {
+                'count': len(samples),
+                'total': sum(durations),
+                'p50': percentile(durations, 50),
+                'p95': percentile(durations, 95),
+                'p99': percentile(durations, 99),
+                'depth': max(s.depth for s in samples),
+                'children': sum(s.children for s in samples) / len(samples),
+                'queries': sum(s.queries for s in samples),
+            }
+        return stats
+
+class PrometheusSink(RingBufferSink):
+    """
+    cumulative counters and buffered quantiles in the Prometheus text
+    format, served by rd_django.views.metrics
+    """
+
+    def __init__(self):
+        super(PrometheusSink, self).__init__()
+        self.lock = threading.Lock()
+        self.counters = collections.defaultdict(lambda: [0, 0.0, 0])
+
+    def record(self, sample):
+        super(PrometheusSink, self).record(sample)
+        with self.lock:
+            counter = self.counters[sample.plugin_type]
+            counter[0] += 1
+            counter[1] += sample.duration
+            counter[2] += sample.queries
+
+    def render(self):
+        lines = [
+            '# HELP rd_plugin_render_seconds render time of a Reddevil '
+            'plugin including its children',
+            '# TYPE rd_plugin_render_seconds summary',
+        ]
+        with self.lock:
+            counters = {k: list(v) for k, v in self.counters.items()}
+        stats = self.stats()
+        for plugin_type, (count, total, queries) in sorted(counters.items()):
+            for q in ('p50', 'p95', 'p99'):
+                if plugin_type in stats:
+                    lines.append(
+                        'rd_plugin_render_seconds{{plugin="{}",quantile="0.{}"}} {:.6f}'
+                        .format(plugin_type, q[1:], stats[plugin_type][q]))
+            lines.append('rd_plugin_render_seconds_count{{plugin="{}"}} {}'
+                .format(plugin_type, count))
+            lines.append('rd_plugin_render_seconds_sum{{plugin="{}"}} {:.6f}'
+                .format(plugin_type, total))
+        lines.append('# TYPE rd_plugin_queries_total counter')
+        for plugin_type, (count, total, queries) in sorted(counters.items()):
+            lines.append('rd_plugin_queries_total{{plugin="{}"}} {}'.format(
+                plugin_type, queries))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,92 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+row packing of the cells of a grid layout
+
+The sizes and offsets of all cells of a layout are laid out in flat arrays,
+one block of cells per breakpoint, with the value of a smaller breakpoint
+inherited by the larger ones as vuetify does. Every breakpoint is then
+packed into rows of 12 columns in a single scan. A cell without a size is
+an auto cell and takes no columns of its own.
+"""
+
+import collections
+import functools
+from array import array
+
+from .models import RdGridCellConstants
+
+COLUMNS = 12
+DISPLAYS = RdGridCellConstants.DISPLAYS
+
+# rows: per display in the order of DISPLAYS, the indexes of the cells
+# starting a row; overflow: the displays at which a row exceeds 12 columns
+LayoutResult = collections.namedtuple('LayoutResult', 'rows overflow')
+
+
+def breakpoint_arrays(cells):
+    """
+    returns the (sizes, offsets) arrays of packed cells, the value of cell
+    i at display d being at index d * len(cells) + i
+    """
+    n = len(cells)
+    sizes = array('B', bytes(5 * n))
+    offsets = array('B', bytes(5 * n))
+    for i, packed in enumerate(cells):
+        size = offset = 0
+        for d in range(5):
+            value = (packed >> (4 * d)) & 15
+            if 0 < value <= COLUMNS:
+                size = value
+            value = (packed >> (4 * d + 20)) & 15
+            if 0 < value <= COLUMNS:
+                offset = value
+            sizes[d * n + i] = size
+            offsets[d * n + i] = offset
+    return sizes, offsets
+
+@functools.lru_cache(maxsize=1024)
+def pack_rows(cells, wrap=True, vertical=False):
+    """
+    returns the LayoutResult of a tuple of packed cells
+    """
+    n = len(cells)
+    sizes, offsets = breakpoint_arrays(cells)
+    rows = []
+    overflow = []
+    for d, display in enumerate(DISPLAYS):
+        base = d * n
+        starts = []
+        used = 0
+        exceeded = False
+        for i in range(n):
+            width = sizes[base + i] + offsets[base + i]
+            if vertical or not starts or \
+                    (wrap and used and used + width > COLUMNS):
+                starts.append(i)
+                used = 0
+            used += width
+            exceeded = exceeded or used > COLUMNS
+        rows.append(tuple(starts))
+        if exceeded:
+            overflow.append(display)
+    return LayoutResult(tuple(rows), tuple(overflow))
+
+def row_breaks(result):
+    """
+    returns the row starts of a LayoutResult by display
+    """
+    return dict(zip(DISPLAYS, result.rows))
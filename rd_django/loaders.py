@@ -0,0 +1,87 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+template loader minifying the rd_django templates
+
+Wraps other loaders, like django's cached loader does:
+
+    'loaders': [
+        ('django.template.loaders.cached.Loader', [
+            ('rd_django.loaders.MinifyLoader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ]),
+    ]
+
+The templates of this package are minified when they are read, so the
+cached loader keeps the minified compiled template. Other templates,
+including project templates overriding those under rd_django/, are passed
+through unchanged.
+"""
+
+import os
+
+from django.template import Origin
+from django.template.loader import get_template
+from django.template.loaders.base import Loader as BaseLoader
+
+from .minify import minify_template
+
+# the templates shipped with rd_django
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    'templates', 'rd_django')
+
+
+def is_shipped(origin_name):
+    """
+    whether a template file is one of the templates of this package
+    """
+    return os.path.dirname(os.path.abspath(origin_name)) == TEMPLATE_DIR
+
+def is_overridden(template_name):
+    """
+    whether the project overrides a template of this package
+    """
+    return not is_shipped(get_template(template_name).origin.name)
+
+
+class MinifyLoader(BaseLoader):
+
+    def __init__(self, engine, loaders):
+        super(MinifyLoader, self).__init__(engine)
+        self.loaders = engine.get_template_loaders(loaders)
+
+    def get_template_sources(self, template_name):
+        for loader in self.loaders:
+            for origin in loader.get_template_sources(template_name):
+                wrapped = Origin(
+                    name=origin.name,
+                    template_name=origin.template_name,
+                    loader=self,
+                )
+                wrapped.inner = origin
+                yield wrapped
+
+    def get_contents(self, origin):
+        contents = origin.inner.loader.get_contents(origin.inner)
+        if is_shipped(origin.name):
+            return minify_template(contents)
+        return contents
+
+    def reset(self):
+        for loader in self.loaders:
+            loader.reset()
@@ -0,0 +1,52 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rd_django.serialization import export_placeholder
+
+
+def get_placeholder(reverse_id, slot):
+    from cms.models import Page, Placeholder
+    try:
+        page = Page.objects.get(reverse_id=reverse_id, publisher_is_draft=True)
+        return page.placeholders.get(slot=slot)
+    except Page.DoesNotExist:
+        raise CommandError('no page with id {}'.format(reverse_id))
+    except Placeholder.DoesNotExist:
+        raise CommandError('page {} has no placeholder {}'.format(
+            reverse_id, slot))
+
+
+class Command(BaseCommand):
+
+    help = 'Exports the Reddevil plugins of a placeholder of a (draft) page ' \
+        'as json lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('reverse_id', help='the id of the page')
+        parser.add_argument('slot', help='the placeholder slot')
+        parser.add_argument('--language', default='en')
+        parser.add_argument('--output', help='file name, default stdout')
+
+    def handle(self, *args, **options):
+        placeholder = get_placeholder(options['reverse_id'], options['slot'])
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                export_placeholder(placeholder, options['language'], f)
+        else:
+            export_placeholder(placeholder, options['language'], sys.stdout)
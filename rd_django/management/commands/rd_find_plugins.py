@@ -0,0 +1,56 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django.core.exceptions import FieldError, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.models import Page, Placeholder
+
+from rd_django.models import RD_PLUGIN_MODELS
+from rd_django.pages import find_usages
+
+MODELS = {model.__name__: model for model in RD_PLUGIN_MODELS.values()}
+
+
+class Command(BaseCommand):
+
+    help = 'Lists the pages and placeholders using a Reddevil plugin ' \
+        'field value, e.g. RdIcon.icon home'
+
+    def add_arguments(self, parser):
+        parser.add_argument('field', help='model and field, e.g. RdIcon.icon')
+        parser.add_argument('value')
+
+    def handle(self, *args, **options):
+        name, _, field = options['field'].partition('.')
+        model = MODELS.get(name)
+        if model is None or not field:
+            raise CommandError('expected one of {} with a field'.format(
+                ', '.join(sorted(MODELS))))
+        try:
+            usages = find_usages(model, field, options['value'])
+        except FieldError:
+            raise CommandError('{} has no field {}'.format(name, field))
+        except (ValueError, ValidationError) as e:
+            raise CommandError('invalid value for {}: {}'.format(
+                options['field'], e))
+        pages = Page.objects.in_bulk({u[0] for u in usages if u[0]})
+        placeholders = Placeholder.objects.in_bulk({u[1] for u in usages})
+        for page_pk, placeholder_pk, language in usages:
+            page = pages.get(page_pk)
+            self.stdout.write('{}\t{}\t{}'.format(
+                page.get_path(language) if page else '-',
+                placeholders[placeholder_pk].slot, language))
+        self.stdout.write('{} placeholders'.format(len(usages)))
@@ -0,0 +1,40 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from rd_django.sprite import build_sprite, is_enabled
+
+
+class Command(BaseCommand):
+
+    help = 'Builds the svg sprite of the icons used by the RdIcon plugins'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='rebuild the sprite from scratch, dropping unused icons',
+        )
+
+    def handle(self, *args, **options):
+        if not is_enabled() or \
+                not getattr(settings, 'RD_ICON_SOURCE_DIR', None):
+            raise CommandError(
+                'RD_ICON_SPRITE and RD_ICON_SOURCE_DIR must be set')
+        added = build_sprite(full=options['full'])
+        self.stdout.write('{} icons added to {}'.format(
+            len(added), settings.RD_ICON_SPRITE))
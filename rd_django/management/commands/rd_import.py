@@ -0,0 +1,44 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from rd_django.serialization import import_placeholder
+from .rd_export import get_placeholder
+
+
+class Command(BaseCommand):
+
+    help = 'Appends Reddevil plugins exported by rd_export to a placeholder ' \
+        'of a (draft) page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('reverse_id', help='the id of the page')
+        parser.add_argument('slot', help='the placeholder slot')
+        parser.add_argument('input', help='file written by rd_export')
+        parser.add_argument('--language',
+            help='language of the new plugins, default that of the export')
+
+    def handle(self, *args, **options):
+        placeholder = get_placeholder(options['reverse_id'], options['slot'])
+        with open(options['input']) as f:
+            try:
+                plugins = import_placeholder(f, placeholder,
+                    options['language'])
+            except ValidationError as e:
+                raise CommandError('; '.join(e.messages))
+        self.stdout.write(self.style.SUCCESS(
+            '{} plugins imported'.format(len(plugins))))
@@ -0,0 +1,38 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django.core.management.base import BaseCommand
+
+from rd_django.models import RD_PLUGIN_MODELS
+from rd_django.payload import rebuild_payloads
+
+
+class Command(BaseCommand):
+
+    help = 'Rebuilds the stored render payloads of the Reddevil plugins'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale',
+            action='store_true',
+            help='only rebuild the payloads of an older version',
+        )
+
+    def handle(self, *args, **options):
+        for model in RD_PLUGIN_MODELS.values():
+            count = rebuild_payloads(model, model.render_values,
+                stale_only=options['stale'])
+            self.stdout.write('{}: {} payloads rebuilt'.format(
+                model.__name__, count))
@@ -0,0 +1,40 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django.core.management.base import BaseCommand
+
+from rd_django.snapshot import publish_snapshots
+
+
+class Command(BaseCommand):
+
+    help = 'Writes static snapshots of the published pages with Reddevil ' \
+        'plugins whose plugin trees changed since the last snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='render all pages, also the unchanged ones',
+        )
+
+    def handle(self, *args, **options):
+        rendered, unchanged, removed = publish_snapshots(
+            force=options['force'],
+            report=lambda url: self.stdout.write('rendered {}'.format(url)),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            '{} rendered, {} unchanged, {} removed'.format(
+                rendered, unchanged, removed)))
@@ -0,0 +1,46 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django.core.management.base import BaseCommand
+
+from rd_django.warm import warm_pages
+
+
+class Command(BaseCommand):
+
+    help = 'Warms the caches by requesting the published pages with ' \
+        'Reddevil plugins, highest priority first'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int,
+            help='number of concurrent requests (default RD_WARM_WORKERS)')
+        parser.add_argument('--rate', type=float,
+            help='maximum requests per second (default RD_WARM_RATE)')
+        parser.add_argument('--limit', type=int,
+            help='only warm this many pages')
+
+    def report(self, done, total, urlpath, status, seconds):
+        self.stdout.write('[{}/{}] {} {} {:.3f}s'.format(
+            done, total, status or 'error', urlpath, seconds))
+
+    def handle(self, *args, **options):
+        warmed, failed = warm_pages(
+            workers=options['workers'],
+            rate=options['rate'],
+            limit=options['limit'],
+            report=self.report,
+        )
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style('{} warmed, {} failed'.format(warmed, failed)))
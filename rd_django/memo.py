@@ -0,0 +1,94 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+request scoped memo of rendered leaf plugins
+
+Leaf plugins of the types in RD_MEMO_PLUGINS are keyed by a hash of their
+render values; identical leaves are rendered once per request. Each
+request keeps at most RD_MEMO_SIZE fragments, least recently used first
+out. The hits and misses are counted per request and per process.
+"""
+
+import collections
+import hashlib
+import threading
+
+from django.conf import settings
+
+from .models import dump_payload
+
+_lock = threading.Lock()
+# process wide counters, summed over all requests
+TOTALS = {'hits': 0, 'misses': 0}
+
+
+class RenderMemo:
+    """
+    the memo of one request
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.fragments = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            self.misses += 1
+            _count('misses')
+        else:
+            self.fragments.move_to_end(key)
+            self.hits += 1
+            _count('hits')
+        return fragment
+
+    def set(self, key, fragment):
+        self.fragments[key] = fragment
+        if len(self.fragments) > self.size:
+            self.fragments.popitem(last=False)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self.fragments)}
+
+
+def _count(name):
+    with _lock:
+        TOTALS[name] += 1
+
+def get_memo(request):
+    memo = getattr(request, 'rd_render_memo', None)
+    if memo is None:
+        memo = request.rd_render_memo = RenderMemo(
+            getattr(settings, 'RD_MEMO_SIZE', 256))
+    return memo
+
+def memo_key(plugin_type, values):
+    return hashlib.sha1('{}:{}'.format(
+        plugin_type, dump_payload(values)).encode()).hexdigest()
+
+def render_counters():
+    """
+    the process wide counters in the Prometheus text format
+    """
+    with _lock:
+        totals = dict(TOTALS)
+    return ''.join(
+        '# TYPE rd_render_memo_{0}_total counter\n'
+        'rd_render_memo_{0}_total {1}\n'.format(name, totals[name])
+        for name in ('hits', 'misses'))
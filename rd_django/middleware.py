@@ -0,0 +1,67 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from .snapshot import BYPASS_HEADER, MANIFEST, get_snapshot_dir, read_manifest
+
+
+class RdSnapshotMiddleware:
+    """
+    serves the static snapshots written by the rd_snapshot command to
+    anonymous visitors, with ETag / If-None-Match support
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.manifest = {}
+        self.mtime = None
+
+    def get_manifest(self, directory):
+        # reload the manifest after each publication of the snapshots
+        try:
+            mtime = os.stat(os.path.join(directory, MANIFEST)).st_mtime
+        except FileNotFoundError:
+            return {}
+        if mtime != self.mtime:
+            self.manifest = read_manifest(directory)
+            self.mtime = mtime
+        return self.manifest
+
+    def __call__(self, request):
+        directory = get_snapshot_dir()
+        if not directory or request.method not in ('GET', 'HEAD') or \
+                request.GET or BYPASS_HEADER in request.META or \
+                settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return self.get_response(request)
+        entry = self.get_manifest(directory).get(request.path)
+        if not entry or 'etag' not in entry:
+            return self.get_response(request)
+        etag = entry['etag']
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            try:
+                with open(os.path.join(directory, entry['file']), 'rb') as f:
+                    content = f.read()
+            except FileNotFoundError:
+                return self.get_response(request)
+            response = HttpResponse(content,
+                content_type=entry['content_type'])
+        response['ETag'] = etag
+        return response
@@ -0,0 +1,78 @@
+# Generated by Django 2.1.8 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+SLOTS = [
+    'xs_size', 'sm_size', 'md_size', 'lg_size', 'xl_size',
+    'xs_offset', 'sm_offset', 'md_offset', 'lg_offset', 'xl_offset',
+]
+BATCH = 500
+
+
+def _slot_value(value):
+    try:
+        value = int(value or 0)
+    except ValueError:
+        return 0
+    return value if 0 <= value <= 12 else 0
+
+def pack_breakpoints(apps, schema_editor):
+    RdGridCell = apps.get_model('rd_django', 'RdGridCell')
+    rows = RdGridCell.objects.order_by('pk').values_list('pk', *SLOTS)
+    batch = {}
+    for n, row in enumerate(rows.iterator(), 1):
+        packed = 0
+        for i, value in enumerate(row[1:]):
+            packed |= _slot_value(value) << (4 * i)
+        if packed:
+            batch.setdefault(packed, []).append(row[0])
+        if n % BATCH == 0:
+            _update(RdGridCell, 'breakpoints', batch)
+            batch = {}
+    _update(RdGridCell, 'breakpoints', batch)
+
+def unpack_breakpoints(apps, schema_editor):
+    RdGridCell = apps.get_model('rd_django', 'RdGridCell')
+    rows = RdGridCell.objects.exclude(breakpoints=0).order_by('pk')
+    batch = {}
+    for n, (pk, packed) in enumerate(
+            rows.values_list('pk', 'breakpoints').iterator(), 1):
+        values = tuple(
+            str((packed >> (4 * i)) & 15 or '') for i in range(len(SLOTS)))
+        batch.setdefault(values, []).append(pk)
+        if n % BATCH == 0:
+            _update(RdGridCell, SLOTS, batch)
+            batch = {}
+    _update(RdGridCell, SLOTS, batch)
+
+def _update(model, fields, batch):
+    # one update per distinct value in the batch
+    for value, pks in batch.items():
+        if isinstance(fields, str):
+            update = {fields: value}
+        else:
+            update = dict(zip(fields, value))
+        model.objects.filter(pk__in=pks).update(**update)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rd_django', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rdgridcell',
+            name='breakpoints',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='packed sizes and offsets'),
+        ),
+        migrations.RunPython(pack_breakpoints, unpack_breakpoints),
+    ] + [
+        migrations.RemoveField(
+            model_name='rdgridcell',
+            name=slot,
+        )
+        for slot in SLOTS
+    ]
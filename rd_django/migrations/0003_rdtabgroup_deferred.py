@@ -0,0 +1,18 @@
+# Generated by Django 2.1.8 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rd_django', '0002_rdgridcell_breakpoints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rdtabgroup',
+            name='deferred',
+            field=models.BooleanField(default=False, verbose_name='Load the content of the hidden tabs on demand'),
+        ),
+    ]
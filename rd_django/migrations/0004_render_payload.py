@@ -0,0 +1,83 @@
+# Generated by Django 2.1.8 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rd_django', '0003_rdtabgroup_deferred'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rdbox',
+            name='payload_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdbox',
+            name='render_payload',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdgridcell',
+            name='payload_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdgridcell',
+            name='render_payload',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdgridcontainer',
+            name='payload_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdgridcontainer',
+            name='render_payload',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdgridlayout',
+            name='payload_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdgridlayout',
+            name='render_payload',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdicon',
+            name='payload_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdicon',
+            name='render_payload',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdtab',
+            name='payload_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdtab',
+            name='render_payload',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdtabgroup',
+            name='payload_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rdtabgroup',
+            name='render_payload',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
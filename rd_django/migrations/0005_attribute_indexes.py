@@ -0,0 +1,28 @@
+# Generated by Django 2.1.8 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rd_django', '0004_render_payload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='rdbox',
+            name='boxtitlecolor',
+            field=models.CharField(db_index=True, default='black', max_length=40, verbose_name='Box title color'),
+        ),
+        migrations.AlterField(
+            model_name='rdgridcontainer',
+            name='gutter',
+            field=models.CharField(blank=True, choices=[('', 'no gutter'), ('xs', 'extra small gutter'), ('sm', 'small gutter'), ('md', 'medium gutter'), ('lg', 'large gutter'), ('xl', 'extra large gutter')], db_index=True, default='', max_length=3, verbose_name='Gutter between cells'),
+        ),
+        migrations.AlterField(
+            model_name='rdicon',
+            name='icon',
+            field=models.CharField(db_index=True, max_length=40, verbose_name='Icon'),
+        ),
+    ]
@@ -0,0 +1,103 @@
+import collections
+import json
+
+from django.db import migrations
+
+# frozen copy of the render values at payload version 2; the rows keep this
+# version, later versions are recomputed on render and stored by
+# rd_rebuild_payloads --stale
+PAYLOAD_VERSION = 2
+BATCH = 500
+
+DISPLAYS = ['xs', 'sm', 'md', 'lg', 'xl']
+SLOT_VALUES = [''] + [str(i + 1) for i in range(12)] + ['', '', '']
+
+
+def container_values(obj):
+    return {
+        'fluid': 'fluid' if obj.container == 'fluid' else '',
+        'gutter': 'grid-list-{}'.format(obj.gutter) if obj.gutter else '',
+    }
+
+def layout_values(obj):
+    return {
+        'direction': 'column' if obj.layout == 'vertical' else 'row',
+        'wrap': 'wrap' if obj.wrap else '',
+    }
+
+def cell_values(obj):
+    values = [SLOT_VALUES[(obj.breakpoints >> (4 * i)) & 15]
+              for i in range(10)]
+    cells = [d + values[i] for i, d in enumerate(DISPLAYS) if values[i]]
+    offsets = ['offset-' + d + values[i + 5]
+               for i, d in enumerate(DISPLAYS) if values[i + 5]]
+    return {'cells': ' '.join(cells), 'offsets': ' '.join(offsets)}
+
+def icon_values(obj):
+    additional = ''
+    if obj.additional_classes:
+        additional = 'class="{}"'.format(obj.additional_classes)
+    return {
+        'icon': obj.icon,
+        'size': obj.size,
+        'color': obj.color,
+        'additional_classes': additional,
+        'class_names': obj.additional_classes,
+    }
+
+def tab_group_values(obj):
+    return {'slidercolor': obj.slidercolor, 'rd_tabs_deferred': obj.deferred}
+
+def tab_values(obj):
+    return {'tabtitle': obj.tabtitle}
+
+def box_values(obj):
+    return {
+        'boxtitle': obj.boxtitle,
+        'boxtitlecolor': obj.boxtitlecolor or 'black',
+        'boxbackgroundcolor': obj.boxbackgroundcolor or 'grey',
+    }
+
+RENDER_VALUES = [
+    ('RdGridContainer', container_values),
+    ('RdGridLayout', layout_values),
+    ('RdGridCell', cell_values),
+    ('RdIcon', icon_values),
+    ('RdTabGroup', tab_group_values),
+    ('RdTab', tab_values),
+    ('RdBox', box_values),
+]
+
+
+def dump_payload(values):
+    return json.dumps(values, sort_keys=True, separators=(',', ':'))
+
+def backfill_payloads(apps, schema_editor, batch_size=BATCH):
+    """
+    stores the payloads of the plugins without one, a batch of rows at a
+    time with one update per distinct payload
+    """
+    for name, render_values in RENDER_VALUES:
+        model = apps.get_model('rd_django', name)
+        pks = list(model.objects.filter(payload_version=0)
+            .order_by('pk').values_list('pk', flat=True))
+        for i in range(0, len(pks), batch_size):
+            payloads = collections.defaultdict(list)
+            for obj in model.objects.filter(pk__in=pks[i:i + batch_size]):
+                payloads[dump_payload(render_values(obj))].append(obj.pk)
+            for payload, group in payloads.items():
+                model.objects.filter(pk__in=group).update(
+                    render_payload=payload,
+                    payload_version=PAYLOAD_VERSION,
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rd_django', '0005_attribute_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_payloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,126 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+whitespace stripping of the Reddevil markup
+
+minify_template rewrites the source of a template once, before it is
+compiled: the whitespace next to a block-level tag is dropped, other
+whitespace between tags is collapsed to one space, the whitespace inside
+start tags is collapsed and a bare variable in a start tag, like the
+{{ wrap }} of <v-layout  {{ direction }} {{ wrap }}>, only outputs its
+separating space when it has a value. minify_markup does the same on
+rendered html, for the direct emitters.
+
+Whitespace between inline elements, like two icons, is rendered as a
+space, so it is kept. Only the whitespace next to the tags of
+BLOCK_TAGS, which the browser does not render, is dropped. The content
+of the RAW_TAGS, which third party plugins may output, is left as it is.
+"""
+
+import functools
+import re
+
+# the tags of the Reddevil markup laid out as blocks or flex items
+BLOCK_TAGS = frozenset([
+    'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p',
+    'v-card', 'v-card-text', 'v-card-title', 'v-container', 'v-flex',
+    'v-layout', 'v-tab', 'v-tab-item', 'v-tabs',
+])
+# elements whose whitespace is rendered or is code
+RAW_TAGS = ('pre', 'textarea', 'script', 'style')
+RAW_ELEMENT = r'<({})(?=[\s/>]).*?</\1\s*>'.format('|'.join(RAW_TAGS))
+# whitespace next to a tag, or in a template next to a template tag; a raw
+# element is matched as a whole, to be kept
+MARKUP_SPACE = re.compile(RAW_ELEMENT + r'|(?<=>)\s+|\s+(?=<)', re.S | re.I)
+MARKUP_START_TAG = re.compile(RAW_ELEMENT + r'|<(?!/)([^>]*)>', re.S | re.I)
+TEMPLATE_SPACE = re.compile(r'(?:(?<=>)|(?<=%}))\s+|\s+(?=<|{%)')
+TAG_NAME = re.compile(r'</?([a-zA-Z][\w-]*)')
+# a start tag, with the quoted strings and template tags it may contain
+START_TAG = re.compile(
+    r'<(?!/)((?:"[^"]*"|{{.*?}}|{%.*?%}|[^>"{]|{(?![{%]))*)>', re.S)
+TAG_PARTS = re.compile(r'("[^"]*"|{{.*?}}|{%.*?%})', re.S)
+# a variable without filters
+VARIABLE = re.compile(r'{{\s*(\w+)\s*}}$')
+
+
+def _is_block(text, pos):
+    if pos < 0:
+        return False
+    match = TAG_NAME.match(text, pos)
+    return bool(match) and match.group(1).lower() in BLOCK_TAGS
+
+def _space(match):
+    text = match.string
+    start, end = match.span()
+    if start and text[start - 1] == '>' and \
+            _is_block(text, text.rfind('<', 0, start)):
+        return ''
+    if end < len(text) and text[end] == '<' and _is_block(text, end):
+        return ''
+    return ' '
+
+def _start_tag(match):
+    parts = TAG_PARTS.split(match.group(1))
+    out = []
+    space = False
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            # markup outside the quoted strings and template tags
+            words = part.split()
+            if out and part[:1].isspace():
+                space = True
+            if words:
+                out.append((' ' if space else '') + ' '.join(words))
+                space = False
+            if part[-1:].isspace():
+                space = True
+            continue
+        variable = VARIABLE.match(part)
+        if space and variable:
+            # a bare variable: no stray space when it is empty
+            out.append('{{% if {} %}} {}{{% endif %}}'.format(
+                variable.group(1), part))
+        else:
+            out.append((' ' if space else '') + part)
+        space = False
+    return '<{}>'.format(''.join(out))
+
+def minify_template(source):
+    """
+    returns the minified source of a template
+    """
+    return START_TAG.sub(_start_tag, TEMPLATE_SPACE.sub(_space, source))
+
+def _markup_space(match):
+    if match.group(1):
+        return match.group(0)
+    return _space(match)
+
+def _collapse_tag(match):
+    if match.group(1):
+        return match.group(0)
+    return '<{}>'.format(' '.join(match.group(2).split()))
+
+def minify_html(html):
+    """
+    returns rendered html with the whitespace between tags minified and
+    the whitespace in start tags collapsed, outside the raw elements
+    """
+    return MARKUP_START_TAG.sub(_collapse_tag,
+        MARKUP_SPACE.sub(_markup_space, html))
+
+# the pieces of the emitters repeat, a piece is minified once
+minify_markup = functools.lru_cache(maxsize=4096)(minify_html)
@@ -13,11 +13,80 @@
 #    limitations under the License.
 
 import collections
+import functools
+import json
 
 from django.db import models
 from cms.models.pluginmodel import CMSPlugin
 
 
+# version of the stored render payloads, raise it whenever a render_values
+# method changes and run the rd_rebuild_payloads command
+RENDER_PAYLOAD_VERSION = 2
+
+def dump_payload(values):
+    return json.dumps(values, sort_keys=True, separators=(',', ':'))
+
+class RdPlugin(CMSPlugin):
+    """
+    common base class of the Reddevil plugin models
+
+    The short description, shown for every plugin on the structure board, is
+    computed by describe() and cached on the instance until the next save.
+
+    The template variables of a plugin are computed by render_values() and
+    stored on save as render payload, which is read back at render time.
+    """
+
+    render_payload = models.TextField(
+        editable=False,
+        blank=True,
+        default='',
+    )
+    payload_version = models.PositiveIntegerField(
+        editable=False,
+        default=0,
+    )
+
+    _short_description = None
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self._short_description = None
+        self.update_payload()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | \
+                {'render_payload', 'payload_version'}
+        return super(RdPlugin, self).save(*args, **kwargs)
+
+    def render_values(self):
+        return {}
+
+    def update_payload(self):
+        self.render_payload = dump_payload(self.render_values())
+        self.payload_version = RENDER_PAYLOAD_VERSION
+
+    def get_render_values(self):
+        if self.payload_version == RENDER_PAYLOAD_VERSION:
+            return json.loads(self.render_payload)
+        # not yet rebuilt after a change of the render values
+        return self.render_values()
+
+    def refresh_from_db(self, *args, **kwargs):
+        self._short_description = None
+        return super(RdPlugin, self).refresh_from_db(*args, **kwargs)
+
+    def describe(self):
+        return super(RdPlugin, self).get_short_description()
+
+    def get_short_description(self):
+        if self._short_description is None:
+            self._short_description = self.describe()
+        return self._short_description
+
+
 # vuetify container
 
 class RdGridContainerConstants:
@@ -34,8 +103,10 @@ class RdGridContainerConstants:
         ('lg', 'large gutter'),
         ('xl', 'extra large gutter'),
     )
+    CONTAINER_LABELS = dict(CONTAINERS)
+    GUTTER_LABELS = dict(GUTTERS)
 
-class RdGridContainer(CMSPlugin):
+class RdGridContainer(RdPlugin):
     """
     a db model for a <v-container> element
     """
@@ -53,22 +124,25 @@ class RdGridContainer(CMSPlugin):
         default=RdGridContainerConstants.GUTTERS[0][0],
         max_length=3,
         blank=True,
+        db_index=True,
     )
 
     def __str__(self):
         return str(self.pk)
 
-    def get_short_description(self):
-        text = ''
-        for item in RdGridContainerConstants.CONTAINERS:
-            if item[0] == self.container:
-                text = item[1]
-        gutter = ''
-        if item[0] == self.container:
-            for item in RdGridContainerConstants.GUTTERS:
-                if item[0] == self.gutter:
-                    gutter = item[1]
-        return '({}, {})'.format(text, gutter)
+    def describe(self):
+        return '({}, {})'.format(
+            RdGridContainerConstants.CONTAINER_LABELS.get(self.container, ''),
+            RdGridContainerConstants.GUTTER_LABELS.get(self.gutter, ''),
+        )
+
+    def render_values(self):
+        values = {'fluid': '', 'gutter': ''}
+        if self.container == 'fluid':
+            values['fluid'] = 'fluid'
+        if self.gutter:
+            values['gutter'] = 'grid-list-{}'.format(self.gutter)
+        return values
 
 # vuetify layout
 
@@ -78,8 +152,9 @@ class RdGridLayoutConstants:
         ('horizontal', 'Horizontal layout'),
         ('vertical', 'Vertical layout'),
     )
+    LAYOUT_LABELS = dict(LAYOUTS)
 
-class RdGridLayout(CMSPlugin):
+class RdGridLayout(RdPlugin):
     """
     a db model for a <v-layout> element
     """
@@ -98,15 +173,50 @@ class RdGridLayout(CMSPlugin):
     def __str__(self):
         return str(self.pk)
 
-    def get_short_description(self):
+    def describe(self):
         text = []
-        for item in RdGridLayoutConstants.LAYOUTS:
-            if item[0] == self.layout:
-                text.append(str(item[1]))
+        if self.layout in RdGridLayoutConstants.LAYOUT_LABELS:
+            text.append(RdGridLayoutConstants.LAYOUT_LABELS[self.layout])
         if self.wrap:
             text.append(str('wrap'))
+        # only with the prefetched children, the structure board shows many
+        # layouts at once
+        overflow = self.check_layout(query=False).overflow
+        if overflow:
+            text.append('overflow at {}'.format(' '.join(overflow)))
         return '({})'.format(', '.join(text))
 
+    def get_cell_breakpoints(self, query=True):
+        """
+        returns the packed breakpoints of the cells, in the order of the
+        children, from the prefetched children when available; without
+        them, from the database or, with query False, none
+        """
+        children = getattr(self, 'child_plugin_instances', None)
+        if children is not None:
+            return tuple(c.breakpoints for c in children
+                         if isinstance(c, RdGridCell))
+        if not query:
+            return ()
+        return tuple(RdGridCell.objects.filter(parent_id=self.pk)
+            .order_by('position').values_list('breakpoints', flat=True))
+
+    def check_layout(self, query=True):
+        """
+        returns the row packing of the cells as a layout.LayoutResult
+        """
+        from .layout import pack_rows
+        return pack_rows(self.get_cell_breakpoints(query), wrap=self.wrap,
+            vertical=self.layout == 'vertical')
+
+    def render_values(self):
+        values = {'direction': 'row', 'wrap': ''}
+        if self.layout == 'vertical':
+            values['direction'] = 'column'
+        if self.wrap:
+            values['wrap'] = 'wrap'
+        return values
+
 
 # veutify flex
 
@@ -114,96 +224,104 @@ class RdGridCellConstants:
 
     SIZES = [('', '')] + [(str(i + 1), str(i + 1)) for i in range(12)]
     DISPLAYS = ['xs', 'sm', 'md', 'lg', 'xl']
+    # the sizes and offsets are packed in 4 bit slots of
+    # RdGridCell.breakpoints, all sizes first, in the order of DISPLAYS
+    SLOTS = ['{}_size'.format(d) for d in DISPLAYS] + \
+        ['{}_offset'.format(d) for d in DISPLAYS]
 
-class RdGridCell(CMSPlugin):
+# slot value -> size string, values above 12 are not used
+_SLOT_VALUES = [''] + [str(i + 1) for i in range(12)] + ['', '', '']
+
+def unpack_breakpoints(packed):
+    """
+    returns the size and offset strings packed in an integer, in the order
+    of RdGridCellConstants.SLOTS
+    """
+    return [_SLOT_VALUES[(packed >> (4 * i)) & 15] for i in range(10)]
+
+def _slot_value(slot, value):
+    number = int(value or 0)
+    if not 0 <= number <= 12:
+        raise ValueError('{} must be between 0 and 12, not {!r}'.format(
+            RdGridCellConstants.SLOTS[slot], value))
+    return number
+
+def pack_breakpoints(values):
+    """
+    packs the size and offset strings, in the order of
+    RdGridCellConstants.SLOTS, in a single integer
+    """
+    packed = 0
+    for i, value in enumerate(values):
+        packed |= _slot_value(i, value) << (4 * i)
+    return packed
+
+@functools.lru_cache(maxsize=1024)
+def decode_classes(packed):
+    """
+    returns the (cells, offsets) class strings of a <v-flex> element
+    """
+    values = unpack_breakpoints(packed)
+    cells = []
+    offsets = []
+    for i, d in enumerate(RdGridCellConstants.DISPLAYS):
+        if values[i]:
+            cells.append(d + values[i])
+        if values[i + 5]:
+            offsets.append('offset-' + d + values[i + 5])
+    return ' '.join(cells), ' '.join(offsets)
+
+def _breakpoint_property(slot):
+    shift = 4 * slot
+
+    def getter(self):
+        return _SLOT_VALUES[(self.breakpoints >> shift) & 15]
+
+    def setter(self, value):
+        self.breakpoints = (self.breakpoints & ~(15 << shift)) | \
+            (_slot_value(slot, value) << shift)
+        self._short_description = None
+
+    return property(getter, setter)
+
+class RdGridCell(RdPlugin):
     """
     a db model for <v-flex> element
     """
 
-    xs_size = models.CharField(
-        verbose_name='width cell for extra small display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
-    )
-    sm_size = models.CharField(
-        verbose_name='width cell for small display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
-    )
-    md_size = models.CharField(
-        verbose_name='width cell medium display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
-    )
-    lg_size = models.CharField(
-        verbose_name='width cell large display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
-    )
-    xl_size = models.CharField(
-        verbose_name='width cell extra large display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
-    )
-    xs_offset = models.CharField(
-        verbose_name='offset for extra small display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
-    )
-    sm_offset = models.CharField(
-        verbose_name='offset for small display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
-    )
-    md_offset = models.CharField(
-        verbose_name='offset medium display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
-    )
-    lg_offset = models.CharField(
-        verbose_name='offset large display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
-    )
-    xl_offset = models.CharField(
-        verbose_name='offset extra large display',
-        choices=RdGridCellConstants.SIZES,
-        default='',
-        blank=True,
-        max_length=2,
+    breakpoints = models.BigIntegerField(
+        verbose_name='packed sizes and offsets',
+        default=0,
+        editable=False,
     )
 
+    # the original size and offset attributes, as strings
+    xs_size = _breakpoint_property(0)
+    sm_size = _breakpoint_property(1)
+    md_size = _breakpoint_property(2)
+    lg_size = _breakpoint_property(3)
+    xl_size = _breakpoint_property(4)
+    xs_offset = _breakpoint_property(5)
+    sm_offset = _breakpoint_property(6)
+    md_offset = _breakpoint_property(7)
+    lg_offset = _breakpoint_property(8)
+    xl_offset = _breakpoint_property(9)
+
     def __str__(self):
         return str(self.pk)
 
-    def get_short_description(self):
-        text = []
-        for d in RdGridCellConstants.DISPLAYS:
-            fieldsize = getattr(self, '{}_size'.format(d))
-            if fieldsize:
-                text.append('{}{}'.format(d, fieldsize))
-        for d in RdGridCellConstants.DISPLAYS:
-            fieldoffset = getattr(self, '{}_offset'.format(d))
-            if fieldoffset:
-                text.append('offset-{}{}'.format(d, fieldoffset))
+    def get_classes(self):
+        """
+        returns the (cells, offsets) class strings of the <v-flex> element
+        """
+        return decode_classes(self.breakpoints)
+
+    def describe(self):
+        return '({})'.format(' '.join(c for c in self.get_classes() if c))
+
+    def render_values(self):
+        cells, offsets = decode_classes(self.breakpoints)
+        return {'cells': cells, 'offsets': offsets}
 
 # icon
 
@@ -216,13 +334,14 @@ class RdIconConstants:
         ('large', 'large'),
         ('x-large', 'extra large'),
     )
+    SIZE_LABELS = dict(SIZES)
     THEMES = (
         ('', 'standard'),
         ('dark', 'dark'),
         ('light', 'light'),
     )
 
-class RdIcon(CMSPlugin):
+class RdIcon(RdPlugin):
     """
     a db model for a vuetify icon
     """
@@ -230,6 +349,7 @@ class RdIcon(CMSPlugin):
     icon = models.CharField(
         verbose_name='Icon',
         max_length=40,
+        db_index=True,
     )
     size = models.CharField(
         verbose_name='size of icon',
@@ -260,19 +380,30 @@ class RdIcon(CMSPlugin):
     def __str__(self):
         return str(self.pk)
 
-    def get_short_description(self):
+    def describe(self):
         text = [self.icon]
-        for sz in RdIconConstants.SIZES:
-            if sz[0] == self.size:
-                text.append(str(sz[1]))
+        if self.size in RdIconConstants.SIZE_LABELS:
+            text.append(RdIconConstants.SIZE_LABELS[self.size])
         if self.color:
             text.append(self.color)
         if self.theme:
             text.append(self.theme)
         return ' '.join(text)
 
+    def render_values(self):
+        values = {
+            'icon': self.icon,
+            'size': self.size,
+            'color': self.color,
+            'additional_classes': '',
+            'class_names': self.additional_classes,
+        }
+        if self.additional_classes:
+            values['additional_classes'] = 'class="{}"'.format(self.additional_classes)
+        return values
+
 
-class RdTabGroup(CMSPlugin):
+class RdTabGroup(RdPlugin):
     """
     a db model for a group of tabs
     """
@@ -281,8 +412,18 @@ class RdTabGroup(CMSPlugin):
         max_length=40,
         default='accent'
     )
+    deferred = models.BooleanField(
+        verbose_name='Load the content of the hidden tabs on demand',
+        default=False,
+    )
+
+    def render_values(self):
+        return {
+            'slidercolor': self.slidercolor,
+            'rd_tabs_deferred': self.deferred,
+        }
 
-class RdTab(CMSPlugin):
+class RdTab(RdPlugin):
     """
     a db model for a tabular UI component inside a tabgroup
     """
@@ -294,7 +435,10 @@ class RdTab(CMSPlugin):
     def __str__(self):
         return self.tabtitle
 
-class RdBox(CMSPlugin):
+    def render_values(self):
+        return {'tabtitle': self.tabtitle}
+
+class RdBox(RdPlugin):
     """
     a db model for a tabular UI component inside a tabgroup
     """
@@ -306,7 +450,8 @@ class RdBox(CMSPlugin):
     boxtitlecolor = models.CharField(
         verbose_name='Box title color',
         max_length=40,
-        default='black'
+        default='black',
+        db_index=True,
     )
     boxbackgroundcolor = models.CharField(
         verbose_name='Box background color title',
@@ -315,3 +460,23 @@ class RdBox(CMSPlugin):
     )
     def __str__(self):
         return self.boxtitle
+
+    def render_values(self):
+        return {
+            'boxtitle': self.boxtitle,
+            'boxtitlecolor': self.boxtitlecolor or 'black',
+            'boxbackgroundcolor': self.boxbackgroundcolor or 'grey',
+        }
+
+
+# the plugin models of this app, keyed by plugin type
+
+RD_PLUGIN_MODELS = collections.OrderedDict([
+    ('RdGridContainerPlugin', RdGridContainer),
+    ('RdGridLayoutPlugin', RdGridLayout),
+    ('RdGridCellPlugin', RdGridCell),
+    ('RdIconPlugin', RdIcon),
+    ('RdTabGroupPlugin', RdTabGroup),
+    ('RdTabPlugin', RdTab),
+    ('RdBoxPlugin', RdBox),
+])
@@ -0,0 +1,72 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+helpers for the cms pages that contain Reddevil plugins
+"""
+
+import hashlib
+
+from cms.models.pluginmodel import CMSPlugin
+
+from .models import RD_PLUGIN_MODELS
+from .prefetch import prefetch_plugins
+
+
+def published_pages():
+    """
+    returns (page, language) for the published pages containing Reddevil
+    plugins
+    """
+    from cms.models import Page
+    pages = Page.objects.filter(
+        publisher_is_draft=False,
+        placeholders__cmsplugin__plugin_type__in=list(RD_PLUGIN_MODELS),
+    ).distinct().order_by('node__path')
+    for page in pages:
+        for language in page.get_published_languages():
+            yield page, language
+
+def tree_hash(page, language):
+    """
+    returns a hash of the content of the plugin trees of a page
+
+    Only the content is hashed, not the pks or dates: republishing a page
+    copies all its plugins, which alone should not count as a change.
+    """
+    sha = hashlib.sha1()
+    for placeholder in page.placeholders.order_by('slot'):
+        sha.update('placeholder:{}\n'.format(placeholder.slot).encode())
+        for plugin in prefetch_plugins(placeholder, language):
+            values = [
+                (f.attname, f.value_to_string(plugin))
+                for f in plugin._meta.local_concrete_fields
+                if f.model is not CMSPlugin and not f.is_relation
+            ]
+            sha.update('{}:{}:{}:{}\n'.format(
+                plugin.plugin_type, plugin.depth, plugin.position,
+                values).encode())
+    return sha.hexdigest()
+
+def find_usages(model, field, value):
+    """
+    returns the distinct (page pk, placeholder pk, language) of the plugins
+    of a Reddevil model with the given field value, in one query on the
+    field's index; the page pk is None for placeholders outside a page
+    """
+    # without the default ordering on path, which would join the distinct
+    return list(model.objects.filter(**{field: value}).order_by()
+        .values_list('placeholder__page', 'placeholder_id', 'language')
+        .distinct())
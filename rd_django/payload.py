@@ -0,0 +1,46 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+batch (re)building of the stored render payloads
+"""
+
+import collections
+
+from .models import RENDER_PAYLOAD_VERSION, dump_payload
+
+BATCH = 500
+
+
+def rebuild_payloads(model, render_values, stale_only=False, batch_size=BATCH):
+    """
+    stores the payloads of a plugin model, computed by render_values(obj),
+    with one update per distinct payload in every batch; returns the number
+    of rows done
+    """
+    queryset = model.objects.order_by('pk')
+    if stale_only:
+        queryset = queryset.exclude(payload_version=RENDER_PAYLOAD_VERSION)
+    pks = list(queryset.values_list('pk', flat=True))
+    for i in range(0, len(pks), batch_size):
+        payloads = collections.defaultdict(list)
+        for obj in model.objects.filter(pk__in=pks[i:i + batch_size]):
+            payloads[dump_payload(render_values(obj))].append(obj.pk)
+        for payload, group in payloads.items():
+            model.objects.filter(pk__in=group).update(
+                render_payload=payload,
+                payload_version=RENDER_PAYLOAD_VERSION,
+            )
+    return len(pks)
@@ -0,0 +1,91 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from cms.models.pluginmodel import CMSPlugin
+from cms.plugin_pool import plugin_pool
+
+from .models import RD_PLUGIN_MODELS
+
+
+def prefetch_plugins(placeholder, language, path=''):
+    """
+    returns the downcasted plugins of a placeholder in tree order, with one
+    query for the plugin types in use and one query per plugin model,
+    optionally limited to the subtree at path
+    """
+    lookups = {
+        'placeholder': placeholder,
+        'language': language,
+    }
+    if path:
+        lookups['path__startswith'] = path
+    # without the default ordering on path, which would defeat distinct
+    plugin_types = CMSPlugin.objects.filter(**lookups).order_by().values_list(
+        'plugin_type', flat=True).distinct()
+    plugins = []
+    for plugin_type in plugin_types:
+        model = RD_PLUGIN_MODELS.get(plugin_type)
+        if model is None:
+            try:
+                model = plugin_pool.get_plugin(plugin_type).model
+            except KeyError:
+                # plugin no longer installed, the cms skips it as well
+                continue
+        plugins.extend(model.objects.filter(
+            plugin_type=plugin_type, **lookups))
+    plugins.sort(key=lambda p: p.path)
+    return plugins
+
+def build_tree(plugins):
+    """
+    wires up child_plugin_instances in memory, returns the root plugins
+
+    The plugins must be in tree order. The roots are the plugins at the
+    top depth; plugins whose parent is missing, e.g. the children of an
+    uninstalled plugin, are left out with their subtrees.
+    """
+    roots = []
+    bypk = {}
+    top = min((plugin.depth for plugin in plugins), default=0)
+    for plugin in plugins:
+        if plugin.pk in bypk:
+            continue
+        parent = bypk.get(plugin.parent_id)
+        if parent is None and plugin.depth != top:
+            continue
+        plugin.child_plugin_instances = []
+        bypk[plugin.pk] = plugin
+        if parent is None:
+            roots.append(plugin)
+        else:
+            plugin.parent = parent
+            parent.child_plugin_instances.append(plugin)
+    return roots
+
+def prefetch_placeholder(placeholder, language):
+    """
+    loads the complete plugin tree of a placeholder and stores it where the
+    cms content renderer looks for it, returns the root plugins
+    """
+    roots = build_tree(prefetch_plugins(placeholder, language))
+    placeholder._plugins_cache = roots
+    return roots
+
+def prefetch_subtree(plugin):
+    """
+    returns the downcasted plugin with its complete subtree loaded
+    """
+    return build_tree(prefetch_plugins(
+        plugin.placeholder_id, plugin.language, plugin.path))[0]
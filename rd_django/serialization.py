@@ -0,0 +1,199 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+json lines serialization of Reddevil plugin trees
+
+The first line is a header, every next line is a plugin, in tree order:
+
+    {"format": "rd_django.tree", "version": 1, "language": "en"}
+    {"id": 12, "parent": null, "type": "RdGridContainerPlugin", "fields": {...}}
+
+The ids are those of the exporting database, they only serve to link a
+plugin to its parent. Plugins that are not Reddevil plugins are left out,
+together with their children.
+"""
+
+import logging
+log = logging.getLogger(__name__)
+
+import collections
+import json
+
+from django.core.exceptions import ValidationError
+from cms.models.pluginmodel import CMSPlugin
+from cms.plugin_pool import plugin_pool
+
+from .batch import parent_error
+from .bulk import bulk_copy_plugins
+from .models import RD_PLUGIN_MODELS
+
+FORMAT = 'rd_django.tree'
+VERSION = 1
+CHUNK = 500
+# derived fields, recomputed on import
+SKIPPED_FIELDS = {'render_payload', 'payload_version'}
+
+
+def serialized_fields(model):
+    return [f for f in model._meta.local_concrete_fields
+            if not (f.remote_field and f.remote_field.parent_link) and
+            f.name not in SKIPPED_FIELDS]
+
+def _records(chunk, skipped):
+    bytype = collections.defaultdict(list)
+    for plugin in chunk:
+        if plugin.plugin_type in RD_PLUGIN_MODELS:
+            bytype[plugin.plugin_type].append(plugin.pk)
+    instances = {}
+    for plugin_type, pks in bytype.items():
+        for obj in RD_PLUGIN_MODELS[plugin_type].objects.filter(pk__in=pks):
+            instances[obj.pk] = obj
+    for plugin in chunk:
+        obj = instances.get(plugin.pk)
+        if obj is None or plugin.parent_id in skipped:
+            skipped.add(plugin.pk)
+            if plugin.parent_id not in skipped:
+                log.warning('%s %s is not exported', plugin.plugin_type,
+                    plugin.pk)
+            continue
+        yield {
+            'id': obj.pk,
+            'parent': obj.parent_id,
+            'type': obj.plugin_type,
+            'fields': {f.attname: f.value_from_object(obj)
+                       for f in serialized_fields(obj.__class__)},
+        }
+
+def iter_export(placeholder, language):
+    """
+    yields the lines of the serialized plugins of a placeholder, reading
+    the database in chunks
+    """
+    yield json.dumps({
+        'format': FORMAT,
+        'version': VERSION,
+        'language': language,
+    }) + '\n'
+    plugins = CMSPlugin.objects.filter(
+        placeholder=placeholder,
+        language=language,
+    ).order_by('path').only('pk', 'parent_id', 'plugin_type')
+    skipped = set()
+    chunk = []
+    for plugin in plugins.iterator(chunk_size=CHUNK):
+        chunk.append(plugin)
+        if len(chunk) == CHUNK:
+            for record in _records(chunk, skipped):
+                yield json.dumps(record, sort_keys=True) + '\n'
+            chunk = []
+    for record in _records(chunk, skipped):
+        yield json.dumps(record, sort_keys=True) + '\n'
+
+def export_placeholder(placeholder, language, stream):
+    """
+    writes the serialized plugins of a placeholder to a text stream
+    """
+    for line in iter_export(placeholder, language):
+        stream.write(line)
+
+def _parse(lineno, line):
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise ValidationError('line {}: invalid json: {}'.format(lineno, e))
+    if not isinstance(record, dict):
+        raise ValidationError('line {}: not a json object'.format(lineno))
+    return record
+
+def _messages(error):
+    if hasattr(error, 'error_dict'):
+        return ['{}: {}'.format(name, message)
+                for name, messages in sorted(error.message_dict.items())
+                for message in messages]
+    return error.messages
+
+def read_plugins(lines, placeholder):
+    """
+    returns the language and the unsaved plugins of serialized lines, after
+    validating the tree for a placeholder and the values of the plugins
+    """
+    lines = iter(lines)
+    header = _parse(1, next(lines, '{}'))
+    if header.get('format') != FORMAT or header.get('version') != VERSION:
+        raise ValidationError('not a {} version {} file'.format(
+            FORMAT, VERSION))
+    types = {}
+    depths = {}
+    plugins = []
+    # the rules only depend on the types, for the same placeholder
+    errors = {}
+    for lineno, line in enumerate(lines, 2):
+        if not line.strip():
+            continue
+        record = _parse(lineno, line)
+        try:
+            pk, parent = record['id'], record['parent']
+            plugin_type, values = record['type'], record['fields']
+        except KeyError as e:
+            raise ValidationError('line {}: missing {}'.format(lineno, e))
+        if parent is not None and parent not in types:
+            raise ValidationError('line {}: unknown parent {}'.format(
+                lineno, parent))
+        try:
+            plugin_pool.get_plugin(plugin_type)
+        except KeyError:
+            raise ValidationError('line {}: unknown plugin type {}'.format(
+                lineno, plugin_type))
+        key = (plugin_type, types.get(parent))
+        if key not in errors:
+            errors[key] = parent_error(placeholder, *key)
+        if errors[key]:
+            raise ValidationError('line {}: {}'.format(lineno, errors[key]))
+        model = RD_PLUGIN_MODELS.get(plugin_type)
+        if model is None:
+            raise ValidationError('line {}: {} is not a Reddevil plugin'
+                .format(lineno, plugin_type))
+        fields = {f.attname: f for f in serialized_fields(model)}
+        plugin = model(plugin_type=plugin_type)
+        try:
+            for attname, value in values.items():
+                if attname in fields:
+                    setattr(plugin, attname, fields[attname].to_python(value))
+            # the fields of CMSPlugin are set by the bulk insert
+            plugin.full_clean(exclude=[f.name for f in model._meta.fields
+                                       if f.attname not in fields],
+                              validate_unique=False)
+        except AttributeError as e:
+            raise ValidationError('line {}: {}'.format(lineno, e))
+        except ValidationError as e:
+            raise ValidationError('line {}: {}'.format(
+                lineno, '; '.join(_messages(e))))
+        plugin.pk = pk
+        plugin.parent_id = parent
+        # the depth places the plugin in the tree of rd_django.bulk
+        plugin.depth = depths[pk] = depths.get(parent, 0) + 1
+        plugin.update_payload()
+        types[pk] = plugin_type
+        plugins.append(plugin)
+    return header.get('language'), plugins
+
+def import_placeholder(lines, placeholder, language=None):
+    """
+    appends the serialized plugins to a placeholder with the bulk insert of
+    rd_django.bulk, returns the new plugins
+    """
+    source_language, plugins = read_plugins(lines, placeholder)
+    return bulk_copy_plugins(plugins, placeholder, language or source_language)
@@ -0,0 +1,79 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from cms import operations
+from cms.models.pluginmodel import CMSPlugin
+from cms.signals import post_placeholder_operation
+
+from .cache import invalidate_fragments, invalidate_placeholders
+from .models import RdIcon
+
+
+@receiver(post_save, dispatch_uid='rd_django_fragment_save')
+@receiver(post_delete, dispatch_uid='rd_django_fragment_delete')
+def bust_fragment_cache(sender, instance, **kwargs):
+    """
+    any plugin change invalidates the cached fragments of its container chain,
+    also for third party plugins nested inside a Reddevil plugin
+    """
+    if not getattr(settings, 'RD_FRAGMENT_CACHE_PLUGINS', None):
+        return
+    from . import batch
+    if isinstance(instance, CMSPlugin) and instance.pk and \
+            not batch.collect(instance):
+        invalidate_fragments(instance)
+
+
+# structure board operations that change the tree without saving plugins
+TREE_OPERATIONS = {
+    operations.MOVE_PLUGIN,
+    operations.CUT_PLUGIN,
+    operations.PASTE_PLUGIN,
+    operations.PASTE_PLACEHOLDER,
+    operations.ADD_PLUGINS_FROM_PLACEHOLDER,
+    operations.CLEAR_PLACEHOLDER,
+}
+PLACEHOLDER_ARGUMENTS = (
+    'placeholder', 'source_placeholder', 'target_placeholder', 'clipboard')
+
+@receiver(post_placeholder_operation, dispatch_uid='rd_django_fragment_tree')
+def bust_fragment_cache_tree(sender, operation, **kwargs):
+    """
+    moves, cuts and pastes update the tree paths and delete in bulk, without
+    a save of the plugins: the fragments of all the Reddevil plugins of the
+    placeholders involved are invalidated
+    """
+    if not getattr(settings, 'RD_FRAGMENT_CACHE_PLUGINS', None) or \
+            operation not in TREE_OPERATIONS:
+        return
+    invalidate_placeholders({kwargs[name].pk for name in PLACEHOLDER_ARGUMENTS
+                             if kwargs.get(name) is not None})
+
+
+@receiver(post_save, sender=RdIcon, dispatch_uid='rd_django_icon_sprite')
+def add_icon_to_sprite(sender, instance, **kwargs):
+    """
+    a new icon is added to the sprite in the background after the commit
+    """
+    if not getattr(settings, 'RD_ICON_SPRITE', None):
+        return
+    from . import sprite
+    if sprite.is_enabled():
+        icon = instance.icon
+        transaction.on_commit(lambda: sprite.schedule_icon(icon))
@@ -0,0 +1,125 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+static html snapshots of the published pages containing Reddevil plugins
+
+The snapshots are written to RD_SNAPSHOT_DIR together with a manifest that
+maps each url path to its file, the content hash of its plugin trees and
+its ETag. The ETag is a hash of the snapshot itself: a snapshot rendered
+again from the same plugin trees, e.g. with --force after a template
+change, gets a new ETag when its html changed.
+"""
+
+import logging
+log = logging.getLogger(__name__)
+
+import hashlib
+import json
+import os
+
+from django.conf import settings
+
+from .pages import published_pages, tree_hash
+
+MANIFEST = 'manifest.json'
+# requests carrying this header always bypass the snapshots
+BYPASS_HEADER = 'HTTP_X_RD_SNAPSHOT'
+
+
+def get_snapshot_dir():
+    return getattr(settings, 'RD_SNAPSHOT_DIR', None)
+
+def _write(path, content):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def write_manifest(directory, manifest):
+    _write(os.path.join(directory, MANIFEST),
+           json.dumps(manifest, indent=1, sort_keys=True).encode())
+
+def snapshot_filename(urlpath):
+    return hashlib.sha1(urlpath.encode()).hexdigest() + '.html'
+
+def snapshot_etag(content):
+    return '"{}"'.format(hashlib.sha1(content).hexdigest())
+
+def publish_snapshots(force=False, report=None):
+    """
+    renders the pages whose plugin trees changed since the last snapshot,
+    returns the number of (rendered, unchanged, removed) snapshots
+    """
+    from django.contrib.sites.models import Site
+    from django.test import Client
+
+    directory = get_snapshot_dir()
+    if not directory:
+        raise ValueError('RD_SNAPSHOT_DIR is not set')
+    os.makedirs(directory, exist_ok=True)
+    old = read_manifest(directory)
+    manifest = {}
+    client = Client(HTTP_HOST=Site.objects.get_current().domain)
+    rendered = unchanged = 0
+    for page, language in published_pages():
+        urlpath = page.get_absolute_url(language)
+        digest = tree_hash(page, language)
+        entry = old.get(urlpath)
+        path = entry and os.path.join(directory, entry['file'])
+        if not force and entry and entry['hash'] == digest and \
+                os.path.exists(path):
+            if 'etag' not in entry:
+                # written before the snapshots had an etag of their own
+                with open(path, 'rb') as f:
+                    entry['etag'] = snapshot_etag(f.read())
+            manifest[urlpath] = entry
+            unchanged += 1
+            continue
+        response = client.get(urlpath, **{BYPASS_HEADER: '1'})
+        if response.status_code != 200:
+            log.warning('snapshot of %s failed with status %s',
+                urlpath, response.status_code)
+            continue
+        filename = snapshot_filename(urlpath)
+        _write(os.path.join(directory, filename), response.content)
+        manifest[urlpath] = {
+            'file': filename,
+            'hash': digest,
+            'etag': snapshot_etag(response.content),
+            'content_type': response['Content-Type'],
+            'page': page.pk,
+            'language': language,
+        }
+        rendered += 1
+        if report:
+            report(urlpath)
+    removed = 0
+    for urlpath, entry in old.items():
+        if urlpath not in manifest:
+            try:
+                os.remove(os.path.join(directory, entry['file']))
+            except FileNotFoundError:
+                pass
+            removed += 1
+    write_manifest(directory, manifest)
+    return rendered, unchanged, removed
@@ -0,0 +1,193 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+svg sprite of the icons used by the RdIcon plugins
+
+The sprite holds a <symbol> for each distinct RdIcon.icon found in the
+database, read from <name>.svg in RD_ICON_SOURCE_DIR, e.g. a local copy of
+the material design icons. It is written to RD_ICON_SPRITE and served at
+RD_ICON_SPRITE_URL. A manifest next to the sprite keeps the symbols, so
+that new icons are added without reading the others again.
+
+A saved RdIcon with an icon that is not in the sprite adds its symbol in a
+background thread, after the commit, so the request does not wait for it.
+"""
+
+import logging
+log = logging.getLogger(__name__)
+
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+ICON_NAME = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
+
+# seconds between the checks for a sprite built by another process
+STAT_INTERVAL = 1.0
+# the font sizes of the vuetify icon sizes, an svg of 1em follows them
+FONT_SIZES = {
+    '': '24px',
+    'small': '16px',
+    'medium': '28px',
+    'large': '36px',
+    'x-large': '40px',
+}
+
+ET.register_namespace('', SVG_NS)
+
+
+def is_enabled():
+    return all(getattr(settings, name, None) for name in (
+        'RD_ICON_SPRITE', 'RD_ICON_SPRITE_URL', 'RD_ICON_SOURCE_DIR'))
+
+def symbol_id(icon):
+    return 'rd-icon-' + icon
+
+def _manifest_path():
+    return settings.RD_ICON_SPRITE + '.json'
+
+def read_manifest():
+    try:
+        with open(_manifest_path()) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def read_symbol(icon):
+    """
+    returns the <symbol> of an icon, or None if there is no svg for it
+    """
+    if not ICON_NAME.match(icon):
+        return None
+    path = os.path.join(settings.RD_ICON_SOURCE_DIR, icon + '.svg')
+    try:
+        root = ET.parse(path).getroot()
+    except (FileNotFoundError, ET.ParseError):
+        return None
+    content = ''.join(ET.tostring(child, encoding='unicode') for child in root)
+    return '<symbol id="{}" viewBox="{}">{}</symbol>'.format(
+        symbol_id(icon), root.get('viewBox', '0 0 24 24'), content)
+
+def _write(path, content):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+def _write_sprite(symbols):
+    _write(settings.RD_ICON_SPRITE,
+        '<svg xmlns="{}" style="display:none">{}</svg>\n'.format(
+            SVG_NS, ''.join(symbols[k] for k in sorted(symbols))))
+    _write(_manifest_path(), json.dumps(symbols, sort_keys=True))
+    _loaded['icons'] = frozenset(symbols)
+    _loaded['mtime'] = os.stat(_manifest_path()).st_mtime
+    _loaded['checked'] = time.monotonic()
+
+def _add(symbols, icons):
+    added = []
+    for icon in sorted(set(icons) - set(symbols)):
+        symbol = read_symbol(icon)
+        if symbol is None:
+            log.warning('no svg for icon %s', icon)
+            _missing.add(icon)
+            continue
+        symbols[icon] = symbol
+        added.append(icon)
+    return added
+
+def add_icons(icons):
+    """
+    adds the symbols of the given icons that are not yet in the sprite,
+    returns the icons added
+    """
+    symbols = read_manifest()
+    added = _add(symbols, icons)
+    if added:
+        _write_sprite(symbols)
+    return added
+
+def build_sprite(full=False):
+    """
+    adds the symbols of the icons in use that are not yet in the sprite,
+    or rebuilds the sprite from scratch; returns the icons added
+    """
+    from .models import RdIcon
+    used = set(RdIcon.objects.values_list('icon', flat=True).distinct())
+    symbols = {} if full else read_manifest()
+    _missing.clear()
+    added = _add(symbols, used)
+    if full:
+        # drop the icons no longer in use
+        symbols = {k: v for k, v in symbols.items() if k in used}
+    if added or full:
+        _write_sprite(symbols)
+    return added
+
+_loaded = {'mtime': None, 'icons': frozenset(), 'checked': None}
+# icons without an svg, not looked up again until the next build
+_missing = set()
+_executor = None
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        # one thread, so the sprite is written by one add at a time
+        _executor = ThreadPoolExecutor(max_workers=1,
+            thread_name_prefix='rd_django_sprite')
+    return _executor
+
+def schedule_icon(icon):
+    """
+    adds an icon to the sprite in the background, unless it is there or
+    has no svg; returns the future or None
+    """
+    if icon in sprite_icons() or icon in _missing:
+        return None
+    return get_executor().submit(add_icons, [icon])
+
+def sprite_icons():
+    """
+    the icons in the sprite, reloaded when another process rebuilt it
+    """
+    now = time.monotonic()
+    checked = _loaded['checked']
+    if checked is not None and now - checked < STAT_INTERVAL:
+        return _loaded['icons']
+    _loaded['checked'] = now
+    try:
+        mtime = os.stat(_manifest_path()).st_mtime
+    except FileNotFoundError:
+        _loaded['icons'], _loaded['mtime'] = frozenset(), None
+        return _loaded['icons']
+    if mtime != _loaded['mtime']:
+        _loaded['icons'] = frozenset(read_manifest())
+        _loaded['mtime'] = mtime
+    return _loaded['icons']
+
+def sprite_href(icon):
+    """
+    returns the reference to the symbol of an icon, or None when the icon
+    is not in the sprite
+    """
+    if not is_enabled() or icon not in sprite_icons():
+        return None
+    return '{}#{}'.format(settings.RD_ICON_SPRITE_URL, symbol_id(icon))
@@ -0,0 +1,68 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+streaming render of Reddevil plugin subtrees
+
+The html of a plugin is sent in chunks as it is rendered: the start of the
+element first, then each child subtree, e.g. each tab of a RdTabGroup, and
+finally the end of the element. Each child subtree is only read from the
+database when its turn comes, so the start of the element goes out before
+any child is loaded.
+"""
+
+from django.http import StreamingHttpResponse
+from django.template import Context
+
+from cms.models.pluginmodel import CMSPlugin
+
+from .emit import emit, emit_deferred, get_shell, is_deferred, render_foreign
+from .prefetch import prefetch_subtree
+
+
+def plugin_context(request):
+    """
+    the minimal context needed to render plugins outside a cms page
+    """
+    from cms.plugin_rendering import ContentRenderer
+    return Context({
+        'request': request,
+        'cms_content_renderer': ContentRenderer(request),
+    })
+
+def stream_plugin(request, plugin):
+    """
+    yields the html chunks of a plugin subtree
+    """
+    context = plugin_context(request)
+    instance = plugin.get_bound_plugin()
+    shell = get_shell(instance)
+    if shell is None:
+        yield render_foreign(prefetch_subtree(plugin), context)
+        return
+    start, before, after, end = shell
+    yield start
+    children = CMSPlugin.objects.filter(parent_id=plugin.pk).order_by('path')
+    for index, child in enumerate(children):
+        if is_deferred(instance, index):
+            yield before + emit_deferred(child.get_bound_plugin()) + after
+        else:
+            yield before + emit(prefetch_subtree(child), context) + after
+    if end:
+        yield end
+
+def stream_plugin_response(request, plugin):
+    return StreamingHttpResponse(stream_plugin(request, plugin),
+        content_type='text/html; charset=utf-8')
@@ -0,0 +1,25 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('metrics/', views.metrics, name='rd_metrics'),
+    path('plugin/<int:pk>/', views.plugin_stream, name='rd_plugin_stream'),
+    path('tab/<int:pk>/', views.tab_content, name='rd_tab'),
+    path('batch/', views.batch_edit, name='rd_batch'),
+]
@@ -0,0 +1,117 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_POST
+from cms.models.pluginmodel import CMSPlugin
+
+from .models import RD_PLUGIN_MODELS
+
+
+def get_visible_plugin(request, pk):
+    """
+    returns a Reddevil plugin if it is on a published page, staff members
+    see all plugins
+    """
+    plugin = get_object_or_404(CMSPlugin, pk=pk,
+        plugin_type__in=list(RD_PLUGIN_MODELS))
+    if request.user.is_staff:
+        return plugin
+    page = plugin.placeholder.page if plugin.placeholder_id else None
+    if page is None or page.publisher_is_draft or \
+            not page.is_published(plugin.language):
+        raise Http404('plugin not published')
+    return plugin
+
+def plugin_stream(request, pk):
+    """
+    streams the html of a Reddevil plugin subtree
+    """
+    from .streaming import stream_plugin_response
+    return stream_plugin_response(request, get_visible_plugin(request, pk))
+
+
+def metrics(request):
+    """
+    render-time metrics of the Reddevil plugins in the Prometheus text
+    format, for staff members unless RD_METRICS_PUBLIC is set
+    """
+    if not (request.user.is_staff or
+            getattr(settings, 'RD_METRICS_PUBLIC', False)):
+        raise PermissionDenied
+    from .instrumentation import PrometheusSink, get_sink
+    from .memo import render_counters
+    sink = get_sink(PrometheusSink)
+    if sink is None:
+        raise Http404('the PrometheusSink is not configured')
+    return HttpResponse(sink.render() + render_counters(),
+        content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def tab_content(request, pk):
+    """
+    the body of a deferred RdTab, as html or as json with ?format=json;
+    rendered through the templates when the project overrides one of them
+    """
+    from .emit import emit, has_overrides, render_foreign
+    from .prefetch import prefetch_subtree
+    from .streaming import plugin_context
+    plugin = get_visible_plugin(request, pk)
+    if plugin.plugin_type != 'RdTabPlugin':
+        raise Http404('not a tab')
+    tab = prefetch_subtree(plugin)
+    context = plugin_context(request)
+    children = tab.child_plugin_instances or []
+    render = render_foreign if has_overrides(children) else emit
+    html = ''.join(render(child, context) for child in children)
+    if request.GET.get('format') == 'json':
+        response = JsonResponse({'pk': tab.pk, 'html': html})
+    else:
+        response = HttpResponse(html, content_type='text/html; charset=utf-8')
+    etag = '"{}"'.format(hashlib.sha1(response.content).hexdigest())
+    response['ETag'] = etag
+    if request.user.is_staff:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True,
+            max_age=getattr(settings, 'RD_TAB_CACHE_SECONDS', 300))
+    return get_conditional_response(request, etag=etag, response=response)
+
+@staff_member_required
+@require_POST
+def batch_edit(request):
+    """
+    applies a json batch of plugin changes, see rd_django.batch
+    """
+    from .batch import apply_batch
+    try:
+        changes = json.loads(request.body.decode())['changes']
+        placeholders = apply_batch(changes)
+    except (ValueError, KeyError, TypeError) as e:
+        return JsonResponse({'error': 'invalid batch: {}'.format(e)},
+            status=400)
+    except ValidationError as e:
+        return JsonResponse({'error': e.messages}, status=400)
+    return JsonResponse({
+        'changes': len(changes),
+        'placeholders': sorted(placeholders),
+    })
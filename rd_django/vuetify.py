@@ -0,0 +1,55 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+the classes vuetify 1.x puts on the root element of its components
+
+With RD_SSR_CLASSES these classes are rendered on the component tags, so
+that the vuetify stylesheet lays out the page before Vue has mounted it.
+Vue merges them with the classes of the component, which are the same.
+"""
+
+from django.utils.html import format_html
+
+
+def _join(*classes):
+    return ' '.join(c for c in classes if c)
+
+# plugin type -> function of the render values returning the classes
+CLASSES = {
+    'RdGridContainerPlugin':
+        lambda v: _join('container', v['fluid'], v['gutter']),
+    'RdGridLayoutPlugin':
+        lambda v: _join('layout', v['direction'], v['wrap']),
+    'RdGridCellPlugin':
+        lambda v: _join('flex', v['cells'], v['offsets']),
+    'RdTabGroupPlugin': lambda v: 'v-tabs',
+    'RdBoxPlugin': lambda v: 'v-card my-2',
+}
+
+def component_classes(plugin_type, values):
+    """
+    returns the classes of the component of a plugin, '' when unknown
+    """
+    classes = CLASSES.get(plugin_type)
+    return classes(values) if classes else ''
+
+def ssr_class(plugin_type, values):
+    """
+    returns the class attribute of the component of a plugin, with a
+    leading space, or ''
+    """
+    classes = component_classes(plugin_type, values)
+    return format_html(' class="{}"', classes) if classes else ''
@@ -0,0 +1,147 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+warming of the caches for the published pages with Reddevil plugins
+
+The pages are requested in-process through the Django test client, from a
+pool of RD_WARM_WORKERS threads, highest priority first. This fills the
+shared caches: the fragment cache and the cms page and placeholder
+caches. The priority of a page is given by the function at the dotted
+path RD_WARM_PRIORITY, called with (page, language, plugin count); by
+default it is the number of Reddevil plugins on the page.
+"""
+
+import logging
+log = logging.getLogger(__name__)
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count
+from django.utils.module_loading import import_string
+from cms.models.pluginmodel import CMSPlugin
+
+from .models import RD_PLUGIN_MODELS
+from .pages import published_pages
+from .snapshot import BYPASS_HEADER
+
+
+def default_priority(page, language, plugins):
+    return plugins
+
+def get_priority():
+    path = getattr(settings, 'RD_WARM_PRIORITY', None)
+    return import_string(path) if path else default_priority
+
+def plugin_counts():
+    """
+    returns the number of Reddevil plugins per published (page, language)
+    """
+    rows = CMSPlugin.objects.filter(
+        placeholder__page__publisher_is_draft=False,
+        plugin_type__in=list(RD_PLUGIN_MODELS),
+    ).order_by().values_list('placeholder__page', 'language') \
+        .annotate(Count('pk'))
+    return {(page, language): count for page, language, count in rows}
+
+def warm_targets():
+    """
+    returns the url paths of the pages to warm, highest priority first
+    """
+    priority = get_priority()
+    counts = plugin_counts()
+    targets = [
+        (priority(page, language, counts.get((page.pk, language), 0)),
+         page.get_absolute_url(language))
+        for page, language in published_pages()
+    ]
+    targets.sort(key=lambda target: target[0], reverse=True)
+    return [urlpath for _, urlpath in targets]
+
+
+class RateLimiter:
+    """
+    spaces the calls of wait() over all threads at rate per second
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next)
+            self.next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def warm_pages(workers=None, rate=None, limit=None, report=None):
+    """
+    requests the pages to warm, at most rate per second, and returns the
+    number of (warmed, failed) pages; report is called with (done, total,
+    url path, status code, seconds) after every page
+    """
+    from django.contrib.sites.models import Site
+    from django.test import Client
+
+    workers = workers or getattr(settings, 'RD_WARM_WORKERS', 4)
+    if rate is None:
+        rate = getattr(settings, 'RD_WARM_RATE', None)
+    urlpaths = warm_targets()[:limit]
+    host = Site.objects.get_current().domain
+    limiter = RateLimiter(rate)
+    local = threading.local()
+
+    def warm(urlpath):
+        # the test client is not thread safe, each thread gets its own
+        if not hasattr(local, 'client'):
+            local.client = Client(HTTP_HOST=host)
+        limiter.wait()
+        close_old_connections()
+        try:
+            start = time.perf_counter()
+            response = local.client.get(urlpath, **{BYPASS_HEADER: '1'})
+            return response.status_code, time.perf_counter() - start
+        finally:
+            close_old_connections()
+
+    warmed = failed = 0
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix='rd_warm') as executor:
+        futures = {executor.submit(warm, u): u for u in urlpaths}
+        for future in as_completed(futures):
+            urlpath = futures[future]
+            try:
+                status, seconds = future.result()
+            except Exception:
+                log.exception('warming %s failed', urlpath)
+                status, seconds = None, 0.0
+            if status == 200:
+                warmed += 1
+            else:
+                failed += 1
+            if report:
+                report(warmed + failed, len(urlpaths), urlpath, status,
+                       seconds)
+    return warmed, failed
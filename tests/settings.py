@@ -0,0 +1,42 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+settings of the rd_django test suite, on top of the benchmark settings
+"""
+
+import os
+import tempfile
+
+from rd_django.benchmark.settings import *  # noqa
+
+# a file database, so that threads see each other's commits; the threads
+# wait longer for the write lock than the default 5 seconds
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'OPTIONS': {'timeout': 60},
+        'TEST': {
+            'NAME': os.path.join(tempfile.gettempdir(), 'rd_django_tests.sqlite3'),
+        },
+    },
+}
+
+# the cms pages of the tests, served through the cms urls
+ROOT_URLCONF = 'tests.urls'
+TEMPLATES = [dict(TEMPLATES[0],
+    DIRS=[os.path.join(os.path.dirname(__file__), 'templates')])]
+CMS_TEMPLATES = CMS_TEMPLATES + [('tests/page.html', 'Test page')]
@@ -0,0 +1,79 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import asyncio
+import time
+from unittest import mock
+
+from cms.models import Placeholder
+from cms.models.pluginmodel import CMSPlugin
+from django.test import TransactionTestCase
+
+from rd_django import asyncrender
+from rd_django.emit import emit
+from rd_django.prefetch import prefetch_subtree
+from rd_django.streaming import plugin_context
+
+from rd_django.benchmark.runner import make_request
+from .utils import add_tab_group
+
+DELAY = 0.2
+
+
+def slow_prefetch_subtree(plugin):
+    # a database answering every subtree query after DELAY seconds
+    time.sleep(DELAY)
+    return prefetch_subtree(plugin)
+
+
+class AsyncRenderTest(TransactionTestCase):
+    """
+    the worker threads read the database on connections of their own, so
+    the data must be committed
+    """
+
+    def setUp(self):
+        self.placeholder = Placeholder.objects.create(slot='test')
+        self.request = make_request()
+
+    def arender(self, plugin):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(
+                asyncrender.arender_plugin(self.request, plugin))
+        finally:
+            loop.close()
+
+    def test_output(self):
+        for deferred in (False, True):
+            group, tabs = add_tab_group(self.placeholder, deferred=deferred)
+            plugin = CMSPlugin.objects.get(pk=group.pk)
+            with self.subTest(deferred=deferred):
+                self.assertEqual(self.arender(plugin), emit(
+                    prefetch_subtree(group), plugin_context(self.request)))
+
+    def test_concurrent_children(self):
+        group, tabs = add_tab_group(self.placeholder, tabs=4)
+        plugin = CMSPlugin.objects.get(pk=group.pk)
+        expected = emit(prefetch_subtree(group), plugin_context(self.request))
+        with mock.patch.object(asyncrender, 'prefetch_subtree',
+                               slow_prefetch_subtree):
+            start = time.perf_counter()
+            html = self.arender(plugin)
+            elapsed = time.perf_counter() - start
+        self.assertEqual(html, expected)
+        # four slow subtrees in parallel, not one after the other, with
+        # room for the queries of a loaded machine
+        self.assertLess(elapsed, 3 * DELAY)
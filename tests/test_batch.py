@@ -0,0 +1,148 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import threading
+
+from cms.models import Placeholder
+from cms.models.pluginmodel import CMSPlugin
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from rd_django.batch import apply_batch
+
+from .utils import fill_placeholder
+
+
+def plugins_of(placeholder, plugin_type):
+    return list(CMSPlugin.objects.filter(placeholder=placeholder,
+        plugin_type=plugin_type).order_by('path'))
+
+
+class BatchMixin(object):
+
+    def assertValidTree(self, placeholder):
+        self.assertEqual(CMSPlugin.find_problems(), ([], [], [], [], []))
+        plugins = list(CMSPlugin.objects.filter(placeholder=placeholder)
+            .order_by('path'))
+        bypath = {plugin.path: plugin for plugin in plugins}
+        siblings = {}
+        for plugin in plugins:
+            parent = bypath.get(plugin.path[:-CMSPlugin.steplen])
+            self.assertEqual(plugin.parent_id, parent and parent.pk)
+            siblings.setdefault(plugin.parent_id, []).append(plugin.position)
+        for positions in siblings.values():
+            self.assertEqual(positions, list(range(len(positions))))
+
+
+class BatchMoveTest(BatchMixin, TestCase):
+
+    def setUp(self):
+        self.placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(self.placeholder, 30)
+        self.cells = plugins_of(self.placeholder, 'RdGridCellPlugin')
+        self.icons = plugins_of(self.placeholder, 'RdIconPlugin')
+
+    def test_move_to_other_parent(self):
+        icon = self.icons[0]
+        target = self.cells[-1]
+        apply_batch([{'pk': icon.pk,
+                      'move': {'target': target.pk, 'pos': 'first-child'}}])
+        icon = CMSPlugin.objects.get(pk=icon.pk)
+        self.assertEqual(icon.parent_id, target.pk)
+        self.assertEqual(icon.position, 0)
+        self.assertValidTree(self.placeholder)
+
+    def test_move_next_to_sibling(self):
+        icon = self.icons[0]
+        other = self.icons[-1]
+        apply_batch([{'pk': icon.pk,
+                      'move': {'target': other.pk, 'pos': 'left'}}])
+        icon = CMSPlugin.objects.get(pk=icon.pk)
+        self.assertEqual(icon.parent_id, other.parent_id)
+        self.assertValidTree(self.placeholder)
+
+    def test_move_to_root(self):
+        icon = self.icons[0]
+        root = plugins_of(self.placeholder, 'RdGridContainerPlugin')[0]
+        apply_batch([{'pk': icon.pk,
+                      'move': {'target': root.pk, 'pos': 'right'}}])
+        icon = CMSPlugin.objects.get(pk=icon.pk)
+        self.assertIsNone(icon.parent_id)
+        self.assertEqual(icon.position, 1)
+        self.assertValidTree(self.placeholder)
+
+    def test_parent_rules(self):
+        container = plugins_of(self.placeholder, 'RdGridContainerPlugin')[0]
+        layout = plugins_of(self.placeholder, 'RdGridLayoutPlugin')[0]
+        tab = plugins_of(self.placeholder, 'RdTabPlugin')[0]
+        invalid = [
+            (self.cells[0], container, 'last-child',
+             'RdGridCellPlugin is no valid child of RdGridContainerPlugin'),
+            (self.cells[0], tab, 'last-child',
+             'RdGridCellPlugin is no valid child of RdTabPlugin'),
+            (self.icons[0], layout, 'last-child',
+             'RdIconPlugin is no valid child of RdGridLayoutPlugin'),
+            (tab, container, 'right', 'RdTabPlugin requires a parent'),
+            (self.cells[0], self.icons[-1], 'first-child',
+             'RdGridCellPlugin is no valid child of RdIconPlugin'),
+        ]
+        for plugin, target, pos, message in invalid:
+            with self.subTest(message=message):
+                with self.assertRaises(ValidationError) as cm:
+                    apply_batch([{'pk': plugin.pk,
+                        'move': {'target': target.pk, 'pos': pos}}])
+                self.assertEqual(cm.exception.messages,
+                    ['plugin {}: {}'.format(plugin.pk, message)])
+        self.assertValidTree(self.placeholder)
+
+
+class ConcurrentBatchTest(BatchMixin, TransactionTestCase):
+    """
+    batches of several threads on the same placeholder, on connections of
+    their own
+    """
+
+    ROUNDS = 10
+
+    def test_concurrent_moves(self):
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, 60)
+        cells = plugins_of(placeholder, 'RdGridCellPlugin')
+        icons = plugins_of(placeholder, 'RdIconPlugin')
+        errors = []
+
+        def worker(icons):
+            try:
+                for i in range(self.ROUNDS):
+                    apply_batch([{'pk': icon.pk, 'move': {
+                        'target': cells[(i + j) % len(cells)].pk,
+                        'pos': 'first-child' if j % 2 else 'last-child',
+                    }} for j, icon in enumerate(icons)])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(icons[i::4],))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertValidTree(placeholder)
+        self.assertEqual(len(plugins_of(placeholder, 'RdIconPlugin')),
+            len(icons))
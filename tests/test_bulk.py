@@ -0,0 +1,103 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from cms.api import add_plugin
+from cms.models import Placeholder
+from cms.models.pluginmodel import CMSPlugin
+from cms.utils.copy_plugins import copy_plugins_to
+from cms.utils.plugins import reorder_plugins
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rd_django.bulk import bulk_copy_placeholder, bulk_copy_plugins
+from rd_django.prefetch import prefetch_plugins
+
+from .utils import fill_placeholder
+
+
+def structure(placeholder):
+    """
+    the plugins of a placeholder in tree order, with their place in the
+    tree and their own field values, but without pks and paths
+    """
+    rows = []
+    index = {}
+    for plugin in prefetch_plugins(placeholder, 'en'):
+        index[plugin.pk] = len(rows)
+        rows.append((
+            plugin.plugin_type,
+            plugin.depth,
+            plugin.numchild,
+            plugin.position,
+            index.get(plugin.parent_id),
+            [(f.attname, f.value_to_string(plugin))
+             for f in plugin._meta.local_concrete_fields
+             if f.model is not CMSPlugin and not f.is_relation],
+        ))
+    return rows
+
+
+class BulkCopyTest(TestCase):
+
+    def setUp(self):
+        self.source = Placeholder.objects.create(slot='source')
+        fill_placeholder(self.source, 60)
+
+    def assertValidTree(self):
+        self.assertEqual(CMSPlugin.find_problems(), ([], [], [], [], []))
+
+    def test_same_structure_as_cms_copy(self):
+        target = Placeholder.objects.create(slot='target')
+        # the target has a root plugin already
+        add_plugin(target, 'RdIconPlugin', 'en', icon='first')
+        expected = Placeholder.objects.create(slot='expected')
+        add_plugin(expected, 'RdIconPlugin', 'en', icon='first')
+        copy_plugins_to(list(self.source.get_plugins('en')), expected, 'en')
+        # the cms renumbers the roots after a paste, bulk copy appends them
+        reorder_plugins(expected, None, 'en', CMSPlugin.objects.filter(
+            placeholder=expected, parent=None).order_by('path')
+            .values_list('pk', flat=True))
+        copies = bulk_copy_placeholder(self.source, target, 'en')
+        self.assertEqual(len(copies), 60)
+        self.assertEqual(structure(target), structure(expected))
+        self.assertValidTree()
+
+    def test_constant_queries(self):
+        queries = []
+        for size in (20, 200):
+            source = Placeholder.objects.create(slot='source')
+            fill_placeholder(source, size)
+            plugins = prefetch_plugins(source, 'en')
+            target = Placeholder.objects.create(slot='target')
+            with CaptureQueriesContext(connection) as captured:
+                bulk_copy_plugins(plugins, target, 'en')
+            queries.append(len(captured))
+            self.assertEqual(structure(target), structure(source))
+        self.assertEqual(queries[0], queries[1])
+        self.assertValidTree()
+
+    def test_copy_subtree(self):
+        plugins = prefetch_plugins(self.source, 'en')
+        group = next(p for p in plugins if p.plugin_type == 'RdTabGroupPlugin')
+        subtree = [p for p in plugins if p.path.startswith(group.path)]
+        target = Placeholder.objects.create(slot='target')
+        bulk_copy_plugins(subtree, target, 'en')
+        self.assertEqual(
+            [row[:3] for row in structure(target)],
+            [('RdTabGroupPlugin', 1, 2), ('RdTabPlugin', 2, 1),
+             ('RdIconPlugin', 3, 0), ('RdTabPlugin', 2, 1),
+             ('RdIconPlugin', 3, 0)])
+        self.assertValidTree()
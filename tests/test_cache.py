@@ -0,0 +1,86 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+
+from cms.api import add_plugin, create_page
+from cms.utils.urlutils import admin_reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from .utils import render
+
+
+@override_settings(RD_FRAGMENT_CACHE_PLUGINS=['RdGridContainerPlugin'])
+class FragmentInvalidationTest(TestCase):
+    """
+    two containers of a layout with one cell, an icon in the first cell
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.page = create_page('cache', 'tests/page.html', 'en')
+        self.placeholder = self.page.placeholders.get(slot='content')
+        self.cells = []
+        for i in range(2):
+            container = add_plugin(self.placeholder, 'RdGridContainerPlugin',
+                'en')
+            layout = add_plugin(self.placeholder, 'RdGridLayoutPlugin', 'en',
+                target=container)
+            self.cells.append(add_plugin(self.placeholder, 'RdGridCellPlugin',
+                'en', target=layout, xs_size='12'))
+        self.icon = add_plugin(self.placeholder, 'RdIconPlugin', 'en',
+            target=self.cells[0], icon='mail')
+        self.html = render(self.placeholder)
+
+    def assertFresh(self):
+        html = render(self.placeholder)
+        cache.clear()
+        self.assertEqual(html, render(self.placeholder))
+        return html
+
+    def test_cached(self):
+        # changed without a signal
+        type(self.icon).objects.filter(pk=self.icon.pk).update(icon='home')
+        self.assertEqual(render(self.placeholder), self.html)
+
+    def test_save(self):
+        self.icon.icon = 'home'
+        self.icon.save()
+        html = self.assertFresh()
+        self.assertIn('>home</v-icon>', html)
+        self.assertNotIn('>mail</v-icon>', html)
+
+    def test_delete(self):
+        self.icon.delete()
+        self.assertNotIn('</v-icon>', self.assertFresh())
+
+    def test_move(self):
+        # the move of the structure board, which does not save the plugins
+        user = User.objects.create_superuser('admin', 'admin@example.com',
+            'admin')
+        self.client.force_login(user)
+        response = self.client.post(
+            admin_reverse('cms_page_move_plugin') + '?cms_path=/', {
+                'plugin_id': self.icon.pk,
+                'placeholder_id': self.placeholder.pk,
+                'plugin_parent': self.cells[1].pk,
+                'target_language': 'en',
+                'plugin_order[]': [self.icon.pk],
+            })
+        self.assertEqual(response.status_code, 200)
+        html = self.assertFresh()
+        self.assertEqual(html.count('>mail</v-icon>'), 1)
+        self.assertNotEqual(html, self.html)
@@ -0,0 +1,55 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+
+from django.template import RequestContext, Template
+from django.test import SimpleTestCase, override_settings
+
+from rd_django.context_processor import tamplate_settings
+
+from rd_django.benchmark.runner import make_request
+
+
+@override_settings(TEMPLATE_SETTINGS=['SITE_TITLE', 'MISSING'],
+                   SITE_TITLE='Reddevil')
+class TemplateSettingsTest(SimpleTestCase):
+
+    def test_values(self):
+        self.assertEqual(dict(tamplate_settings(None)), {
+            'SITE_TITLE': 'Reddevil',
+            'MISSING': None,
+        })
+
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            tamplate_settings(None)['SITE_TITLE'] = 'other'
+
+    def test_computed_once(self):
+        self.assertIs(tamplate_settings(None), tamplate_settings(None))
+
+    def test_setting_changed(self):
+        before = tamplate_settings(None)
+        with override_settings(SITE_TITLE='Chessdevil'):
+            self.assertEqual(tamplate_settings(None)['SITE_TITLE'],
+                'Chessdevil')
+        self.assertEqual(tamplate_settings(None)['SITE_TITLE'], 'Reddevil')
+        self.assertIsNot(tamplate_settings(None), before)
+        with override_settings(TEMPLATE_SETTINGS=[]):
+            self.assertEqual(dict(tamplate_settings(None)), {})
+
+    def test_request_context(self):
+        context = RequestContext(make_request(), processors=[tamplate_settings])
+        self.assertEqual(Template('{{ SITE_TITLE }}').render(context),
+            'Reddevil')
@@ -0,0 +1,55 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from django.test import TestCase, override_settings
+
+from .utils import fill_placeholder, generate_placeholder, render
+
+
+class DirectEmitTest(TestCase):
+    """
+    the direct emitters give the same bytes as the templates
+    """
+
+    def assertSameOutput(self, placeholder):
+        html = render(placeholder)
+        with override_settings(RD_DIRECT_EMIT=True):
+            self.assertEqual(render(placeholder), html)
+        return html
+
+    def test_generated_trees(self):
+        for seed in range(4):
+            with self.subTest(seed=seed):
+                self.assertSameOutput(
+                    generate_placeholder(depth=3, fanout=3, seed=seed))
+
+    def test_escaping(self):
+        from cms.models import Placeholder
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, 20)
+        html = self.assertSameOutput(placeholder)
+        self.assertIn('box &amp; &lt;b&gt;', html)
+        self.assertIn('tab &quot;0&quot;', html)
+        self.assertIn('class="ml-2"', html)
+
+    def test_grid_markup(self):
+        from cms.models import Placeholder
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, 4)
+        with override_settings(RD_DIRECT_EMIT=True):
+            html = render(placeholder)
+        self.assertIn('<v-container   grid-list-md>', html)
+        self.assertIn('<v-layout  row wrap>', html)
+        self.assertIn('<v-flex xs12 md6 >', html)
@@ -0,0 +1,76 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# imported when their feature is used, not when the plugins are loaded
+LAZY_MODULES = [
+    'rd_django.batch',
+    'rd_django.emit',
+    'rd_django.forms',
+    'rd_django.layout',
+    'rd_django.memo',
+    'rd_django.sprite',
+    'rd_django.vuetify',
+]
+
+# microseconds of the rd_django imports at startup, beyond django and cms
+BUDGET = 50000
+
+SCRIPT = '''
+import sys
+import django
+django.setup()
+import rd_django.cms_plugins, rd_django.signals
+print(' '.join(sorted(m for m in sys.modules if m.startswith('rd_django'))))
+'''
+
+
+class ImportTimeTest(SimpleTestCase):
+
+    def startup(self):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='tests.settings')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT],
+            cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, check=True)
+        times = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            own, cumulative, name = line[len('import time:'):].split('|')
+            times.append((name.strip(), int(own)))
+        return result.stdout.split(), times
+
+    def test_startup(self):
+        modules, times = self.startup()
+        self.assertIn('rd_django.cms_plugins', modules)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, modules)
+        # -X importtime lists the modules imported by import statements,
+        # nested ones indented under their importer: the time of a module
+        # of its own, without its imports, counts once
+        rd_times = [own for name, own in times
+                    if name.startswith('rd_django') and
+                    not name.startswith('rd_django.benchmark')]
+        self.assertTrue(rd_times)
+        total = sum(rd_times)
+        self.assertLess(total, BUDGET)
@@ -0,0 +1,59 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from cms.models import Placeholder
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rd_django.instrumentation import percentile
+
+from .utils import fill_placeholder, render
+
+
+class PercentileTest(SimpleTestCase):
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        for p in (1, 50, 95, 99, 100):
+            self.assertEqual(percentile(values, p), p)
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 75), 3)
+        self.assertEqual(percentile([1, 2, 3, 4], 76), 4)
+        self.assertEqual(percentile([7], 0), 7)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+@override_settings(RD_INSTRUMENTATION_SINKS=[
+    'rd_django.instrumentation.PrometheusSink'])
+class MetricsViewTest(TestCase):
+
+    def setUp(self):
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, 10)
+        render(placeholder)
+        self.url = reverse('rd_metrics')
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        staff = User.objects.create_user('staff', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'RdIconPlugin', response.content)
+
+    @override_settings(RD_METRICS_PUBLIC=True)
+    def test_public(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
@@ -0,0 +1,89 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+
+from cms.models import Placeholder
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from rd_django import memo
+from rd_django.memo import RenderMemo, memo_key, render_counters
+
+from rd_django.benchmark.runner import make_request, render_placeholder
+from .utils import fill_placeholder, render
+
+
+class RenderMemoTest(SimpleTestCase):
+
+    def test_lru(self):
+        fragments = RenderMemo(2)
+        fragments.set('a', 'A')
+        fragments.set('b', 'B')
+        self.assertEqual(fragments.get('a'), 'A')
+        # b is the least recently used
+        fragments.set('c', 'C')
+        self.assertIsNone(fragments.get('b'))
+        self.assertEqual(fragments.get('a'), 'A')
+        self.assertEqual(fragments.get('c'), 'C')
+        self.assertEqual(fragments.stats(),
+            {'hits': 3, 'misses': 1, 'size': 2})
+
+    def test_totals(self):
+        before = dict(memo.TOTALS)
+        fragments = RenderMemo(1)
+        fragments.get('a')
+        fragments.set('a', 'A')
+        fragments.get('a')
+        fragments.get('a')
+        self.assertEqual(memo.TOTALS, {'hits': before['hits'] + 2,
+                                       'misses': before['misses'] + 1})
+        self.assertIn('rd_render_memo_hits_total {}\n'.format(
+            memo.TOTALS['hits']), render_counters())
+
+    def test_key(self):
+        self.assertEqual(memo_key('RdIconPlugin', {'icon': 'a', 'size': ''}),
+            memo_key('RdIconPlugin', {'size': '', 'icon': 'a'}))
+        self.assertNotEqual(memo_key('RdIconPlugin', {'icon': 'a'}),
+            memo_key('RdIconPlugin', {'icon': 'b'}))
+        self.assertNotEqual(memo_key('RdIconPlugin', {}),
+            memo_key('RdBoxPlugin', {}))
+
+
+class MemoRenderTest(TestCase):
+
+    def setUp(self):
+        self.placeholder = Placeholder.objects.create(slot='test')
+        # 15 icons of 3 kinds and a box without children
+        fill_placeholder(self.placeholder, 45)
+        self.html = render(self.placeholder)
+
+    def render(self):
+        request = make_request()
+        return render_placeholder(self.placeholder, request), \
+            request.rd_render_memo.stats()
+
+    @override_settings(RD_MEMO_PLUGINS=['RdIconPlugin', 'RdBoxPlugin'])
+    def test_output(self):
+        html, stats = self.render()
+        self.assertEqual(html, self.html)
+        self.assertEqual(stats, {'hits': 12, 'misses': 4, 'size': 4})
+        with override_settings(RD_DIRECT_EMIT=True):
+            self.assertEqual(render(self.placeholder), self.html)
+
+    @override_settings(RD_MEMO_PLUGINS=['RdIconPlugin'], RD_MEMO_SIZE=1)
+    def test_size(self):
+        html, stats = self.render()
+        self.assertEqual(html, self.html)
+        self.assertEqual(stats['size'], 1)
+        self.assertGreater(stats['misses'], 3)
@@ -0,0 +1,151 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import os
+import shutil
+import tempfile
+
+from cms.api import add_plugin
+from cms.models import Placeholder
+from cms.plugin_base import CMSPluginBase
+from cms.plugin_pool import plugin_pool
+from django.conf import settings
+from django.template import engines
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from rd_django.benchmark.runner import dom_tokens
+from rd_django.minify import minify_html, minify_template
+
+from .utils import fill_placeholder, render
+
+
+def minify_loaders(dirs=()):
+    options = dict(settings.TEMPLATES[0]['OPTIONS'], loaders=[
+        ('rd_django.loaders.MinifyLoader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ])
+    return [dict(settings.TEMPLATES[0], APP_DIRS=False, DIRS=list(dirs),
+                 OPTIONS=options)]
+
+
+class RawPlugin(CMSPluginBase):
+    """
+    a third party plugin with whitespace that must be kept
+    """
+
+    name = 'Raw'
+    render_template = 'tests/raw.html'
+
+
+class MinifyTest(SimpleTestCase):
+
+    def test_inline_space(self):
+        self.assertEqual(minify_html(
+            '<v-flex xs12>\n  <v-icon>a</v-icon>\n  <svg\n  class="x">'
+            '</svg>\n</v-flex>\n'),
+            '<v-flex xs12><v-icon>a</v-icon> <svg class="x"></svg>'
+            '</v-flex>')
+        self.assertEqual(minify_html('<b>a</b>\n <i>b</i>'),
+            '<b>a</b> <i>b</i>')
+
+    def test_raw_elements(self):
+        for html in (
+                '<pre class="code">def f():\n    <b>x</b>\n</pre>',
+                '<textarea name="t">\n  a\n\n  b  </textarea>',
+                '<script>\nif (a <b && c> d) {\n  f();\n}\n</script>',
+                '<STYLE>\n  p > b { margin: 0 }\n</STYLE>'):
+            with self.subTest(html=html):
+                self.assertEqual(minify_html(
+                    '<v-flex>\n  ' + html + '\n  <b>a</b>\n</v-flex>'),
+                    '<v-flex>' + html + ' <b>a</b></v-flex>')
+        # not a raw element
+        self.assertEqual(minify_html('<v-flex>\n<prefix>\n</prefix>\n'
+            '</v-flex>'), '<v-flex><prefix> </prefix></v-flex>')
+
+    def test_template_space(self):
+        self.assertEqual(minify_template(
+            '<v-flex>\n  {% for p in ps %}\n    {{ p }}\n  {% endfor %}\n'
+            '</v-flex>'),
+            '<v-flex>{% for p in ps %} {{ p }} {% endfor %}</v-flex>')
+
+    def test_start_tag_variables(self):
+        self.assertEqual(minify_template('<v-layout  {{ wrap }}>'),
+            '<v-layout{% if wrap %} {{ wrap }}{% endif %}>')
+        # literals and filters may output something for an empty value
+        self.assertEqual(minify_template('<v-icon  {{ "x" }}>'),
+            '<v-icon {{ "x" }}>')
+        self.assertEqual(minify_template("<v-icon {{ a|default:'b' }}>"),
+            "<v-icon {{ a|default:'b' }}>")
+
+    def test_overrides(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        os.mkdir(os.path.join(tmp, 'rd_django'))
+        source = '<pre>\n  a  </pre>\n<b>x</b>\n'
+        with open(os.path.join(tmp, 'rd_django', 'icon.html'), 'w') as f:
+            f.write(source)
+        with override_settings(TEMPLATES=minify_loaders([tmp])):
+            engine = engines['django']
+            self.assertEqual(
+                engine.get_template('rd_django/icon.html').render(), source)
+            self.assertNotIn('\n', engine.get_template(
+                'rd_django/tab_deferred.html').render())
+
+
+class DomEquivalenceTest(TestCase):
+    """
+    minified output renders as the normal output
+    """
+
+    def test_modes(self):
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, 60)
+        html = render(placeholder)
+        with override_settings(RD_DIRECT_EMIT=True):
+            self.assertEqual(render(placeholder), html)
+        tokens = dom_tokens(html)
+        with override_settings(TEMPLATES=minify_loaders()):
+            template = render(placeholder)
+        with override_settings(RD_DIRECT_EMIT=True, RD_MINIFY=True):
+            emitted = render(placeholder)
+        for minified in (template, emitted):
+            self.assertEqual(dom_tokens(minified), tokens)
+            self.assertLess(len(minified), len(html) * 3 // 4)
+        self.assertEqual(emitted, minify_html(emitted))
+
+    def test_dom_tokens(self):
+        self.assertNotEqual(dom_tokens('<v-flex><b>a</b> <b>b</b></v-flex>'),
+            dom_tokens('<v-flex><b>a</b><b>b</b></v-flex>'))
+        self.assertEqual(dom_tokens('<v-flex>\n <b>a</b>  <b>b</b>\n</v-flex>'),
+            dom_tokens('<v-flex><b>a</b> <b>b</b></v-flex>'))
+
+    def test_foreign_plugins(self):
+        plugin_pool.register_plugin(RawPlugin)
+        self.addCleanup(plugin_pool.unregister_plugin, RawPlugin)
+        placeholder = Placeholder.objects.create(slot='test')
+        container = add_plugin(placeholder, 'RdGridContainerPlugin', 'en')
+        layout = add_plugin(placeholder, 'RdGridLayoutPlugin', 'en',
+            target=container)
+        cell = add_plugin(placeholder, 'RdGridCellPlugin', 'en',
+            target=layout, xs_size='12')
+        add_plugin(placeholder, 'RawPlugin', 'en', target=cell)
+        with override_settings(RD_DIRECT_EMIT=True, RD_MINIFY=True):
+            html = render(placeholder)
+        for raw in ('<pre>def f():\n    <b>x</b>\n</pre>',
+                    '<textarea>\n  a\n</textarea>',
+                    '<script>\n  f();\n</script>'):
+            self.assertIn(raw, html)
@@ -0,0 +1,89 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from cms.api import add_plugin
+from cms.models import Placeholder
+from django.test import SimpleTestCase, TestCase
+
+from rd_django.models import (RdGridCell, RdGridCellConstants, RdGridLayout,
+    decode_classes, pack_breakpoints, unpack_breakpoints)
+from rd_django.prefetch import build_tree, prefetch_plugins
+
+
+class BreakpointsTest(SimpleTestCase):
+
+    def test_pack(self):
+        values = ['12', '6', '', '4', '3', '', '', '2', '', '12']
+        packed = pack_breakpoints(values)
+        self.assertEqual(unpack_breakpoints(packed), values)
+        self.assertEqual(decode_classes(packed), (
+            'xs12 sm6 lg4 xl3', 'offset-md2 offset-xl12'))
+
+    def test_properties(self):
+        cell = RdGridCell()
+        for i, slot in enumerate(RdGridCellConstants.SLOTS):
+            setattr(cell, slot, str(i + 1))
+        self.assertEqual([getattr(cell, slot)
+            for slot in RdGridCellConstants.SLOTS],
+            [str(i + 1) for i in range(10)])
+        cell.md_size = ''
+        self.assertEqual(cell.md_size, '')
+        self.assertEqual(cell.lg_size, '4')
+
+    def test_range(self):
+        cell = RdGridCell()
+        cell.xs_size = '12'
+        for value in ('13', '-1', 16, 'x'):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    cell.sm_offset = value
+                with self.assertRaises(ValueError):
+                    pack_breakpoints(['', value])
+        self.assertEqual(cell.breakpoints, 12)
+
+
+class LayoutDescriptionTest(TestCase):
+
+    def setUp(self):
+        self.placeholder = Placeholder.objects.create(slot='test')
+        for i in range(3):
+            container = add_plugin(self.placeholder, 'RdGridContainerPlugin',
+                'en')
+            layout = add_plugin(self.placeholder, 'RdGridLayoutPlugin', 'en',
+                target=container, wrap=False)
+            for j in range(2):
+                add_plugin(self.placeholder, 'RdGridCellPlugin', 'en',
+                    target=layout, xs_size='8')
+
+    def test_without_children(self):
+        layouts = list(RdGridLayout.objects.all())
+        with self.assertNumQueries(0):
+            for layout in layouts:
+                self.assertEqual(layout.get_short_description(),
+                    '(Horizontal layout)')
+        # an explicit check reads the cells
+        with self.assertNumQueries(1):
+            self.assertEqual(layouts[0].check_layout().overflow,
+                tuple(RdGridCellConstants.DISPLAYS))
+
+    def test_prefetched_children(self):
+        plugins = prefetch_plugins(self.placeholder, 'en')
+        build_tree(plugins)
+        layouts = [plugin for plugin in plugins
+                   if isinstance(plugin, RdGridLayout)]
+        with self.assertNumQueries(0):
+            for layout in layouts:
+                self.assertEqual(layout.get_short_description(),
+                    '(Horizontal layout, overflow at xs sm md lg xl)')
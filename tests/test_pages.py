@@ -0,0 +1,64 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import io
+
+from cms.api import add_plugin, create_page
+from cms.models import Placeholder
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from rd_django.models import RdIcon
+from rd_django.pages import find_usages
+
+
+class FindUsagesTest(TestCase):
+
+    def setUp(self):
+        self.page = create_page('usages', 'rd_django/fragment.html', 'en')
+        self.placeholder = Placeholder.objects.create(slot='content')
+        self.page.placeholders.add(self.placeholder)
+        self.other = Placeholder.objects.create(slot='other')
+        for placeholder in (self.placeholder, self.other):
+            for i in range(5):
+                add_plugin(placeholder, 'RdIconPlugin', 'en', icon='home')
+        add_plugin(self.other, 'RdIconPlugin', 'nl', icon='home')
+
+    def test_distinct(self):
+        self.assertEqual(sorted(find_usages(RdIcon, 'icon', 'home'),
+            key=lambda usage: usage[1:]), [
+            (self.page.pk, self.placeholder.pk, 'en'),
+            (None, self.other.pk, 'en'),
+            (None, self.other.pk, 'nl'),
+        ])
+        self.assertEqual(find_usages(RdIcon, 'icon', 'mail'), [])
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('rd_find_plugins', 'RdIcon.icon', 'home', stdout=out)
+        self.assertEqual(out.getvalue().splitlines()[-1], '3 placeholders')
+
+    def test_command_errors(self):
+        for args, message in [
+            (['RdIcon.colour', 'red'], 'RdIcon has no field colour'),
+            (['RdIcon', 'red'], 'expected one of'),
+            (['RdGridCell.breakpoints', 'all'],
+             'invalid value for RdGridCell.breakpoints'),
+        ]:
+            with self.subTest(args=args):
+                with self.assertRaises(CommandError) as cm:
+                    call_command('rd_find_plugins', *args)
+                self.assertTrue(str(cm.exception).startswith(message))
@@ -0,0 +1,68 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import importlib
+import io
+
+from cms.models import Placeholder
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase
+
+from rd_django.models import RD_PLUGIN_MODELS, RENDER_PAYLOAD_VERSION
+
+from .utils import fill_placeholder, render
+
+
+class RebuildPayloadsTest(TestCase):
+
+    def test_stale_payloads(self):
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, 30)
+        html = render(placeholder)
+        # the rows as the migration leaves them
+        for model in RD_PLUGIN_MODELS.values():
+            model.objects.update(render_payload='', payload_version=0)
+        self.assertEqual(render(placeholder), html)
+        out = io.StringIO()
+        call_command('rd_rebuild_payloads', stale=True, stdout=out)
+        self.assertIn('RdIcon: 10 payloads rebuilt', out.getvalue())
+        for model in RD_PLUGIN_MODELS.values():
+            self.assertFalse(model.objects.exclude(
+                payload_version=RENDER_PAYLOAD_VERSION).exists())
+        self.assertEqual(render(placeholder), html)
+
+
+class BackfillMigrationTest(TestCase):
+
+    def test_backfill(self):
+        migration = importlib.import_module(
+            'rd_django.migrations.0006_backfill_render_payload')
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, 30)
+        html = render(placeholder)
+        expected = {model: sorted(model.objects.values_list(
+            'pk', 'render_payload')) for model in RD_PLUGIN_MODELS.values()}
+        # the rows as migration 0004 leaves them
+        for model in RD_PLUGIN_MODELS.values():
+            model.objects.update(render_payload='', payload_version=0)
+        migration.backfill_payloads(apps, None, batch_size=4)
+        for model in RD_PLUGIN_MODELS.values():
+            self.assertFalse(model.objects.exclude(
+                payload_version=migration.PAYLOAD_VERSION).exists())
+            if migration.PAYLOAD_VERSION == RENDER_PAYLOAD_VERSION:
+                self.assertEqual(sorted(model.objects.values_list(
+                    'pk', 'render_payload')), expected[model])
+        self.assertEqual(render(placeholder), html)
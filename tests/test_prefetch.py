@@ -0,0 +1,81 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from cms.models import Placeholder
+from cms.models.pluginmodel import CMSPlugin
+from django.test import TestCase
+
+from rd_django.prefetch import (
+    build_tree,
+    prefetch_placeholder,
+    prefetch_plugins,
+    prefetch_subtree,
+)
+
+from .utils import fill_placeholder
+
+
+def walk(plugins):
+    for plugin in plugins:
+        yield plugin
+        yield from walk(plugin.child_plugin_instances)
+
+
+class PrefetchTest(TestCase):
+
+    def check_tree(self, size, models):
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, size)
+        expected = dict(CMSPlugin.objects.filter(placeholder=placeholder)
+            .values_list('pk', 'parent_id'))
+        # one query for the plugin types in use, one per plugin model
+        with self.assertNumQueries(1 + models):
+            roots = prefetch_placeholder(placeholder, 'en')
+        nodes = list(walk(roots))
+        self.assertEqual(len(nodes), size)
+        self.assertEqual(
+            {p.pk: getattr(p.parent, 'pk', None) for p in nodes}, expected)
+        self.assertEqual([p.path for p in nodes], list(
+            CMSPlugin.objects.filter(placeholder=placeholder)
+            .order_by('path').values_list('path', flat=True)))
+
+    def test_10_plugins(self):
+        self.check_tree(10, 5)
+
+    def test_100_plugins(self):
+        self.check_tree(100, 7)
+
+    def test_1000_plugins(self):
+        self.check_tree(1000, 7)
+
+    def test_subtree(self):
+        placeholder = Placeholder.objects.create(slot='test')
+        plugins = fill_placeholder(placeholder, 30)
+        group = next(p for p in plugins if p.plugin_type == 'RdTabGroupPlugin')
+        with self.assertNumQueries(1 + 3):
+            subtree = prefetch_subtree(group)
+        self.assertEqual(subtree.pk, group.pk)
+        self.assertEqual([p.plugin_type for p in walk([subtree])], [
+            'RdTabGroupPlugin', 'RdTabPlugin', 'RdIconPlugin',
+            'RdTabPlugin', 'RdIconPlugin'])
+
+    def test_orphans_are_dropped(self):
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, 10)
+        plugins = [p for p in prefetch_plugins(placeholder, 'en')
+                   if p.plugin_type != 'RdGridLayoutPlugin']
+        roots = build_tree(plugins)
+        self.assertEqual([p.plugin_type for p in walk(roots)],
+            ['RdGridContainerPlugin'])
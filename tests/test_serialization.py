@@ -0,0 +1,182 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import io
+import json
+import os
+import tempfile
+
+from cms.api import add_plugin, create_page
+from cms.models import Placeholder
+from cms.models.pluginmodel import CMSPlugin
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from rd_django.serialization import iter_export, import_placeholder
+
+from .test_bulk import structure
+from .utils import fill_placeholder
+
+HEADER = '{"format": "rd_django.tree", "version": 1, "language": "en"}\n'
+
+
+def appended(rows):
+    """
+    the structure rows once more, after the rows themselves
+    """
+    roots = sum(1 for row in rows if row[4] is None)
+    return [row[:3] + (row[3] + roots, None) + row[5:] if row[4] is None
+            else row[:4] + (row[4] + len(rows),) + row[5:] for row in rows]
+
+
+class SerializationTest(TestCase):
+
+    def setUp(self):
+        self.source = Placeholder.objects.create(slot='source')
+        self.target = Placeholder.objects.create(slot='target')
+
+    def assertImportError(self, lines, message):
+        with self.assertRaises(ValidationError) as cm:
+            import_placeholder(lines, self.target)
+        self.assertEqual(cm.exception.messages, [message])
+        self.assertFalse(CMSPlugin.objects.filter(placeholder=self.target))
+
+    def test_round_trip(self):
+        fill_placeholder(self.source, 60)
+        plugins = import_placeholder(iter_export(self.source, 'en'),
+            self.target)
+        self.assertEqual(len(plugins), 60)
+        self.assertEqual(structure(self.target), structure(self.source))
+        self.assertEqual(CMSPlugin.find_problems(), ([], [], [], [], []))
+
+    def test_round_trip_appends(self):
+        fill_placeholder(self.source, 20)
+        lines = list(iter_export(self.source, 'en'))
+        import_placeholder(lines, self.target)
+        import_placeholder(lines, self.target)
+        rows = structure(self.source)
+        self.assertEqual(structure(self.target), rows + appended(rows))
+
+    def test_skips_foreign_plugins(self):
+        add_plugin(self.source, 'AliasPlugin', 'en')
+        fill_placeholder(self.source, 10)
+        with self.assertLogs('rd_django.serialization', 'WARNING'):
+            lines = list(iter_export(self.source, 'en'))
+        self.assertEqual(len(lines), 11)
+        import_placeholder(lines, self.target)
+        # the alias is the first root of the source
+        self.assertEqual(structure(self.target), [
+            row[:3] + (row[3] - 1, None) + row[5:] if row[4] is None
+            else row[:4] + (row[4] - 1,) + row[5:]
+            for row in structure(self.source)[1:]])
+
+    def test_invalid_json(self):
+        fill_placeholder(self.source, 3)
+        lines = list(iter_export(self.source, 'en'))
+        lines[2] = lines[2][:20] + '\n'
+        with self.assertRaises(ValidationError) as cm:
+            import_placeholder(lines, self.target)
+        self.assertTrue(cm.exception.messages[0].startswith(
+            'line 3: invalid json: '))
+
+    def test_invalid_header(self):
+        self.assertImportError([], 'not a rd_django.tree version 1 file')
+        self.assertImportError(['[]\n'], 'line 1: not a json object')
+
+    def test_foreign_plugin_type(self):
+        record = {'id': 1, 'parent': None, 'type': 'AliasPlugin',
+                  'fields': {}}
+        self.assertImportError([HEADER, json.dumps(record)],
+            'line 2: AliasPlugin is not a Reddevil plugin')
+        record['type'] = 'TextPlugin'
+        self.assertImportError([HEADER, json.dumps(record)],
+            'line 2: unknown plugin type TextPlugin')
+
+    def test_missing_key(self):
+        record = {'id': 1, 'parent': None, 'type': 'RdIconPlugin'}
+        self.assertImportError([HEADER, json.dumps(record)],
+            "line 2: missing 'fields'")
+
+    def test_invalid_field(self):
+        records = [
+            {'id': 1, 'parent': None, 'type': 'RdGridContainerPlugin',
+             'fields': {}},
+            {'id': 2, 'parent': 1, 'type': 'RdGridLayoutPlugin',
+             'fields': {}},
+            {'id': 3, 'parent': 2, 'type': 'RdGridCellPlugin',
+             'fields': {'breakpoints': 'all'}},
+        ]
+        self.assertImportError([HEADER] + [json.dumps(r) for r in records],
+            "line 4: 'all' value must be an integer.")
+        record = {'id': 1, 'parent': None, 'type': 'RdIconPlugin',
+                  'fields': []}
+        with self.assertRaises(ValidationError) as cm:
+            import_placeholder([HEADER, json.dumps(record)], self.target)
+        self.assertTrue(cm.exception.messages[0].startswith('line 2: '))
+
+    def test_clean(self):
+        record = {'id': 1, 'parent': None, 'type': 'RdIconPlugin',
+                  'fields': {'icon': 'x' * 41, 'size': 'huge'}}
+        self.assertImportError([HEADER, json.dumps(record)],
+            'line 2: icon: Ensure this value has at most 40 characters '
+            '(it has 41).; '
+            "size: Value 'huge' is not a valid choice.")
+
+    def test_placeholder_conf(self):
+        fill_placeholder(self.source, 10)
+        lines = list(iter_export(self.source, 'en'))
+        conf = {'target': {
+            'child_classes': {'RdGridContainerPlugin': ['RdBoxPlugin']},
+        }}
+        with override_settings(CMS_PLACEHOLDER_CONF=conf):
+            self.assertImportError(lines,
+                'line 3: RdGridLayoutPlugin is no valid child of '
+                'RdGridContainerPlugin')
+        conf = {'target': {'require_parent': True}}
+        with override_settings(CMS_PLACEHOLDER_CONF=conf):
+            self.assertImportError(lines,
+                'line 2: RdGridContainerPlugin requires a parent')
+        # other placeholders keep the rules of the plugin classes
+        import_placeholder(lines, self.source)
+
+
+class ImportCommandTest(TestCase):
+
+    def setUp(self):
+        page = create_page('import', 'rd_django/fragment.html', 'en',
+            reverse_id='import')
+        self.placeholder = Placeholder.objects.create(slot='content')
+        page.placeholders.add(self.placeholder)
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def test_round_trip(self):
+        fill_placeholder(self.placeholder, 20)
+        call_command('rd_export', 'import', 'content', output=self.path)
+        out = io.StringIO()
+        call_command('rd_import', 'import', 'content', self.path, stdout=out)
+        self.assertIn('20 plugins imported', out.getvalue())
+        rows = structure(self.placeholder)
+        self.assertEqual(rows[20:], appended(rows[:20]))
+
+    def test_error(self):
+        with open(self.path, 'w') as f:
+            f.write(HEADER + '{"id": 1,\n')
+        with self.assertRaises(CommandError) as cm:
+            call_command('rd_import', 'import', 'content', self.path)
+        self.assertTrue(str(cm.exception).startswith('line 2: invalid json'))
@@ -0,0 +1,129 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from cms.api import create_page
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from rd_django.middleware import RdSnapshotMiddleware
+from rd_django.pages import published_pages
+from rd_django.snapshot import read_manifest
+
+from .utils import publish_page, serve_site
+
+
+class SnapshotTestCase(TestCase):
+
+    def setUp(self):
+        serve_site()
+        # the cms caches the pages, which get the same pks in every test
+        cache.clear()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        override = override_settings(RD_SNAPSHOT_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.page = publish_page('snapshot')
+        self.urlpath = self.page.get_absolute_url('en')
+
+    def snapshot(self, *args):
+        out = StringIO()
+        call_command('rd_snapshot', *args, stdout=out)
+        return out.getvalue()
+
+
+class PublishedPagesTest(SnapshotTestCase):
+
+    def test_pages(self):
+        create_page('plain', 'tests/page.html', 'en', published=True)
+        publish_page('second')
+        draft = self.page.publisher_draft
+        pages = list(published_pages())
+        self.assertEqual(len(pages), 2)
+        self.assertIn((self.page, 'en'), pages)
+        self.assertNotIn((draft, 'en'), pages)
+
+
+class SnapshotCommandTest(SnapshotTestCase):
+
+    def test_snapshot(self):
+        self.assertIn('1 rendered, 0 unchanged, 0 removed', self.snapshot())
+        entry = read_manifest(self.directory)[self.urlpath]
+        with open(os.path.join(self.directory, entry['file'])) as f:
+            html = f.read()
+        self.assertIn('<v-flex xs12 md6 >', html)
+        self.assertIn('0 rendered, 1 unchanged, 0 removed', self.snapshot())
+        self.assertIn('1 rendered, 0 unchanged, 0 removed',
+            self.snapshot('--force'))
+
+    def test_removed(self):
+        self.snapshot()
+        self.page.publisher_draft.unpublish('en')
+        self.assertIn('0 rendered, 0 unchanged, 1 removed', self.snapshot())
+        self.assertEqual(os.listdir(self.directory), ['manifest.json'])
+
+
+class SnapshotMiddlewareTest(SnapshotTestCase):
+
+    def setUp(self):
+        super(SnapshotMiddlewareTest, self).setUp()
+        self.snapshot()
+        self.middleware = RdSnapshotMiddleware(
+            lambda request: HttpResponse('live'))
+        self.factory = RequestFactory()
+
+    def test_served(self):
+        response = self.middleware(self.factory.get(self.urlpath))
+        self.assertIn(b'<v-flex xs12 md6 >', response.content)
+        etag = response['ETag']
+        response = self.middleware(
+            self.factory.get(self.urlpath, HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag(self):
+        etag = self.middleware(self.factory.get(self.urlpath))['ETag']
+        self.snapshot('--force')
+        self.assertEqual(
+            self.middleware(self.factory.get(self.urlpath))['ETag'], etag)
+        # the same plugin trees, rendered to other html
+        cache.clear()
+        with override_settings(RD_SSR_CLASSES=True):
+            self.snapshot('--force')
+        response = self.middleware(
+            self.factory.get(self.urlpath, HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'class="container grid-list-md"', response.content)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_bypassed(self):
+        for request in (
+                self.factory.get('/other/'),
+                self.factory.get(self.urlpath, {'q': '1'}),
+                self.factory.post(self.urlpath),
+                self.factory.get(self.urlpath, HTTP_X_RD_SNAPSHOT='1')):
+            with self.subTest(path=request.get_full_path(),
+                              method=request.method):
+                self.assertEqual(self.middleware(request).content, b'live')
+        self.factory.cookies['sessionid'] = 'x'
+        self.assertEqual(
+            self.middleware(self.factory.get(self.urlpath)).content, b'live')
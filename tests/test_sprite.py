@@ -0,0 +1,122 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from cms.api import add_plugin
+from cms.models import Placeholder
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rd_django import sprite
+
+from .utils import fill_placeholder, render
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">' \
+    '<path d="M{} 0h24v24H0z"/></svg>'
+
+
+class SpriteMixin(object):
+
+    def setUp(self):
+        super(SpriteMixin, self).setUp()
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        source = os.path.join(self.dir, 'svg')
+        os.mkdir(source)
+        for i, icon in enumerate(('home', 'mail')):
+            with open(os.path.join(source, icon + '.svg'), 'w') as f:
+                f.write(SVG.format(i))
+        settings = override_settings(
+            RD_ICON_SPRITE=os.path.join(self.dir, 'sprite.svg'),
+            RD_ICON_SPRITE_URL='/static/sprite.svg',
+            RD_ICON_SOURCE_DIR=source,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        sprite._loaded.update(mtime=None, icons=frozenset(), checked=None)
+        sprite._missing.clear()
+        self.placeholder = Placeholder.objects.create(slot='test')
+
+
+class SpriteTest(SpriteMixin, TestCase):
+
+    def test_partial_settings(self):
+        with override_settings(RD_ICON_SOURCE_DIR=None):
+            self.assertFalse(sprite.is_enabled())
+            add_plugin(self.placeholder, 'RdIconPlugin', 'en', icon='home')
+            self.assertIsNone(sprite.sprite_href('home'))
+
+    def test_render(self):
+        fill_placeholder(self.placeholder, 20)
+        with self.assertLogs('rd_django.sprite', 'WARNING'):
+            self.assertEqual(sprite.build_sprite(), ['home', 'mail'])
+        html = render(self.placeholder)
+        with override_settings(RD_DIRECT_EMIT=True):
+            self.assertEqual(render(self.placeholder), html)
+        self.assertIn(
+            '<svg class="v-icon rd-icon" width="1em" height="1em" '
+            'style="font-size:16px" fill="currentColor" aria-hidden="true">'
+            '<use href="/static/sprite.svg#rd-icon-home"></use></svg>', html)
+        self.assertIn('<svg class="v-icon rd-icon red--text ml-2" ', html)
+        self.assertNotIn(' --text', html)
+        self.assertIn('style="font-size:24px"', html)
+        self.assertIn('>star</v-icon>', html)
+
+    def test_stat_interval(self):
+        sprite.add_icons(['home'])
+        with mock.patch('os.stat') as stat:
+            for i in range(10):
+                sprite.sprite_href('home')
+        self.assertFalse(stat.called)
+
+    def test_missing_svg(self):
+        with self.assertLogs('rd_django.sprite', 'WARNING'):
+            self.assertEqual(sprite.add_icons(['home', 'nosvg']), ['home'])
+        self.assertIsNone(sprite.schedule_icon('home'))
+        self.assertIsNone(sprite.schedule_icon('nosvg'))
+
+
+class SpriteSignalTest(SpriteMixin, TransactionTestCase):
+    """
+    the signal adds the icon after the commit, in a thread of its own
+    """
+
+    def wait(self):
+        sprite.get_executor().submit(lambda: None).result()
+
+    def test_saved_icon(self):
+        with mock.patch.object(sprite, 'add_icons',
+                               wraps=sprite.add_icons) as add_icons:
+            with CaptureQueriesContext(connection) as queries:
+                add_plugin(self.placeholder, 'RdIconPlugin', 'en', icon='mail')
+            self.wait()
+            add_icons.assert_called_once_with(['mail'])
+            # no scan of the RdIcon table
+            self.assertFalse([q for q in queries
+                              if 'SELECT DISTINCT' in q['sql']])
+            self.assertEqual(sprite.sprite_icons(), {'mail'})
+            add_plugin(self.placeholder, 'RdIconPlugin', 'en', icon='mail')
+            with self.assertLogs('rd_django.sprite', 'WARNING'):
+                add_plugin(self.placeholder, 'RdIconPlugin', 'en',
+                    icon='nosvg')
+                self.wait()
+            add_plugin(self.placeholder, 'RdIconPlugin', 'en', icon='nosvg')
+            self.wait()
+            self.assertEqual(add_icons.call_count, 2)
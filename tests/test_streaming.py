@@ -0,0 +1,62 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from cms.models import Placeholder
+from cms.models.pluginmodel import CMSPlugin
+from django.test import TestCase
+
+from rd_django.emit import emit
+from rd_django.prefetch import prefetch_subtree
+from rd_django.streaming import plugin_context, stream_plugin
+
+from rd_django.benchmark.runner import make_request
+from .utils import add_tab_group
+
+
+class StreamingTest(TestCase):
+
+    def setUp(self):
+        self.placeholder = Placeholder.objects.create(slot='test')
+        self.request = make_request()
+
+    def check_stream(self, deferred):
+        group, tabs = add_tab_group(self.placeholder, deferred=deferred)
+        chunks = list(stream_plugin(self.request, group))
+        # start, one chunk per tab, end
+        self.assertEqual(len(chunks), 5)
+        html = ''.join(chunks)
+        self.assertEqual(html, emit(prefetch_subtree(group),
+            plugin_context(self.request)))
+        return html
+
+    def test_equivalence(self):
+        html = self.check_stream(deferred=False)
+        self.assertEqual(html.count('<v-flex'), 6)
+        self.assertEqual(html.count('data-rd-tab-src='), 0)
+
+    def test_equivalence_deferred(self):
+        html = self.check_stream(deferred=True)
+        self.assertEqual(html.count('<v-flex'), 2)
+        self.assertEqual(html.count('data-rd-tab-src='), 2)
+
+    def test_lazy_loading(self):
+        group, tabs = add_tab_group(self.placeholder)
+        # as the view passes it, not downcasted
+        chunks = stream_plugin(self.request, CMSPlugin.objects.get(pk=group.pk))
+        # the start of <v-tabs> only needs the group itself
+        with self.assertNumQueries(1):
+            self.assertIn('<v-tabs', next(chunks))
+        with self.assertNumQueries(1 + 1 + 5):
+            self.assertIn('tab0', next(chunks))
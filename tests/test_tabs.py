@@ -0,0 +1,107 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import os
+import shutil
+import tempfile
+
+from cms.api import create_page
+from cms.models import Placeholder
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .utils import add_tab_group, render
+
+
+class DeferredTabsTest(TestCase):
+
+    def setUp(self):
+        self.placeholder = Placeholder.objects.create(slot='test')
+        self.group, self.tabs = add_tab_group(self.placeholder,
+            deferred=True)
+        self.staff = User.objects.create_user('staff', password='x',
+            is_staff=True)
+
+    def test_only_first_tab_rendered(self):
+        html = render(self.placeholder)
+        self.assertEqual(html.count('<v-flex'), 2)
+        self.assertEqual(html.count('data-rd-tab-src='), 2)
+        self.assertIn(reverse('rd_tab', args=[self.tabs[1].pk]), html)
+        with override_settings(RD_DIRECT_EMIT=True):
+            self.assertEqual(render(self.placeholder), html)
+
+    def test_tab_content(self):
+        self.client.force_login(self.staff)
+        url = reverse('rd_tab', args=[self.tabs[1].pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        html = response.content.decode()
+        self.assertEqual(html.count('<v-flex'), 2)
+        self.assertIn('tab1', html)
+        self.assertNotIn('tab0', html)
+        self.assertIn('private', response['Cache-Control'])
+        # the body is the one the tab renders when it is not deferred
+        self.group.deferred = False
+        self.group.save()
+        self.assertIn(html, render(self.placeholder))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, {'format': 'json'})
+        self.assertEqual(response.json(), {'pk': self.tabs[1].pk, 'html': html})
+
+    def test_unpublished_tab_hidden(self):
+        response = self.client.get(reverse('rd_tab', args=[self.tabs[1].pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_not_a_tab(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('rd_tab', args=[self.group.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_tab_content_override(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        os.mkdir(os.path.join(tmp, 'rd_django'))
+        with open(os.path.join(tmp, 'rd_django', 'icon.html'), 'w') as f:
+            f.write('<i class="override">{{ icon }}</i>')
+        templates = [dict(settings.TEMPLATES[0], DIRS=[tmp])]
+        self.client.force_login(self.staff)
+        url = reverse('rd_tab', args=[self.tabs[1].pk])
+        with override_settings(TEMPLATES=templates):
+            html = self.client.get(url).content.decode()
+            self.assertIn('<i class="override">tab1</i>', html)
+            self.assertEqual(html.count('<v-flex'), 2)
+            self.group.deferred = False
+            self.group.save()
+            self.assertIn(html, render(self.placeholder))
+
+
+class EditModeTest(TestCase):
+
+    def test_tabs_not_deferred(self):
+        page = create_page('tabs', 'tests/page.html', 'en')
+        placeholder = page.placeholders.get(slot='content')
+        group, tabs = add_tab_group(placeholder, deferred=True)
+        user = User.objects.create_superuser('admin', 'admin@example.com',
+            'admin')
+        self.client.force_login(user)
+        html = self.client.get(page.get_absolute_url('en'),
+            {'edit': ''}).content.decode()
+        for i in range(3):
+            self.assertIn('>tab{}</v-icon>'.format(i), html)
+        self.assertNotIn('data-rd-tab-src=', html)
@@ -0,0 +1,99 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+
+from cms.models import Placeholder
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from rd_django import models
+from rd_django.vuetify import component_classes, ssr_class
+
+from .utils import fill_placeholder, render
+
+
+class ClassMappingTest(SimpleTestCase):
+    """
+    the classes vuetify 1.x renders on the root element of the components
+    """
+
+    def assertClasses(self, plugin_type, instance, classes):
+        self.assertEqual(
+            component_classes(plugin_type, instance.render_values()), classes)
+
+    def test_container(self):
+        for data, classes in (
+                ({}, 'container'),
+                ({'container': 'fluid'}, 'container fluid'),
+                ({'gutter': 'md'}, 'container grid-list-md'),
+                ({'container': 'fluid', 'gutter': 'xl'},
+                 'container fluid grid-list-xl')):
+            with self.subTest(**data):
+                self.assertClasses('RdGridContainerPlugin',
+                    models.RdGridContainer(**data), classes)
+
+    def test_layout(self):
+        for data, classes in (
+                ({}, 'layout row wrap'),
+                ({'wrap': False}, 'layout row'),
+                ({'layout': 'vertical'}, 'layout column wrap'),
+                ({'layout': 'vertical', 'wrap': False}, 'layout column')):
+            with self.subTest(**data):
+                self.assertClasses('RdGridLayoutPlugin',
+                    models.RdGridLayout(**data), classes)
+
+    def test_cell(self):
+        for data, classes in (
+                ({}, 'flex'),
+                ({'xs_size': '12'}, 'flex xs12'),
+                ({'xs_size': '12', 'md_offset': '2'}, 'flex xs12 offset-md2'),
+                ({'sm_size': '6', 'lg_size': '3', 'xl_size': '2'},
+                 'flex sm6 lg3 xl2'),
+                ({'xs_offset': '1', 'sm_offset': '3'},
+                 'flex offset-xs1 offset-sm3')):
+            with self.subTest(**data):
+                cell = models.RdGridCell()
+                for name, value in data.items():
+                    setattr(cell, name, value)
+                self.assertClasses('RdGridCellPlugin', cell, classes)
+
+    def test_tabs_and_box(self):
+        self.assertEqual(component_classes('RdTabGroupPlugin', {}), 'v-tabs')
+        self.assertEqual(component_classes('RdBoxPlugin', {}), 'v-card my-2')
+
+    def test_other_plugins(self):
+        self.assertEqual(component_classes('RdIconPlugin', {}), '')
+        self.assertEqual(ssr_class('RdTabPlugin', {}), '')
+
+    def test_class_attribute(self):
+        self.assertEqual(ssr_class('RdBoxPlugin', {}), ' class="v-card my-2"')
+
+
+class SsrClassesTest(TestCase):
+
+    def test_markup(self):
+        placeholder = Placeholder.objects.create(slot='test')
+        fill_placeholder(placeholder, 20)
+        plain = render(placeholder)
+        with override_settings(RD_SSR_CLASSES=True):
+            html = render(placeholder)
+            with override_settings(RD_DIRECT_EMIT=True):
+                self.assertEqual(render(placeholder), html)
+        self.assertNotIn(' class="container', plain)
+        self.assertIn('<v-container class="container grid-list-md"', html)
+        self.assertIn('<v-layout class="layout row wrap"', html)
+        self.assertIn('<v-flex class="flex xs12 md6"', html)
+        self.assertIn('<v-flex class="flex xs12 md6 offset-md1"', html)
+        self.assertIn('<v-tabs class="v-tabs"', html)
+        self.assertIn('<v-card class="v-card my-2">', html)
@@ -0,0 +1,74 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+from io import StringIO
+
+from cms.api import add_plugin, create_page
+from cms.models import Placeholder
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from rd_django.cache import get_cached_fragment
+from rd_django.models import RdGridContainer
+from rd_django.warm import plugin_counts
+
+from .utils import publish_page, serve_site
+
+
+class PluginCountsTest(TestCase):
+
+    def test_counts(self):
+        page = create_page('warm', 'rd_django/fragment.html', 'en',
+            published=True)
+        public = page.publisher_public
+        placeholder = Placeholder.objects.create(slot='content')
+        public.placeholders.add(placeholder)
+        for i in range(5):
+            add_plugin(placeholder, 'RdIconPlugin', 'en', icon='home')
+        add_plugin(placeholder, 'RdIconPlugin', 'nl', icon='home')
+        # the draft page does not count
+        draft = Placeholder.objects.create(slot='content')
+        page.placeholders.add(draft)
+        add_plugin(draft, 'RdIconPlugin', 'en', icon='home')
+        self.assertEqual(plugin_counts(), {
+            (public.pk, 'en'): 5,
+            (public.pk, 'nl'): 1,
+        })
+
+
+@override_settings(RD_FRAGMENT_CACHE_PLUGINS=['RdGridContainerPlugin'])
+class WarmCacheCommandTest(TransactionTestCase):
+    """
+    the pages are requested from worker threads, which read the database
+    on connections of their own
+    """
+
+    def setUp(self):
+        serve_site()
+        cache.clear()
+        self.pages = [publish_page('warm {}'.format(i)) for i in range(3)]
+
+    def test_warm(self):
+        containers = RdGridContainer.objects.filter(
+            placeholder__page__in=self.pages)
+        self.assertEqual(len(containers), 3)
+        for container in containers:
+            self.assertIsNone(get_cached_fragment(container))
+        out = StringIO()
+        call_command('rd_warm_cache', '--workers', '2', stdout=out)
+        self.assertIn('3 warmed, 0 failed', out.getvalue())
+        for container in containers:
+            self.assertIn('<v-container', get_cached_fragment(container))
@@ -0,0 +1,122 @@
+#    Copyright 2017 - 2018 Ruben Decrop
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+"""
+plugin trees and rendering helpers shared by the tests
+"""
+
+from cms.api import add_plugin, create_page
+from cms.models import Placeholder
+
+from rd_django.benchmark.generator import TreeGenerator
+from rd_django.benchmark.runner import make_request, render_placeholder
+
+
+class _Full(Exception):
+    pass
+
+
+def fill_placeholder(placeholder, size, language='en'):
+    """
+    adds exactly size plugins of all Reddevil types to a placeholder:
+    containers with a layout of cells holding an icon or a box, and groups
+    of tabs; returns the plugins added
+    """
+    plugins = []
+
+    def add(plugin_type, target=None, **data):
+        if len(plugins) == size:
+            raise _Full
+        plugins.append(add_plugin(placeholder, plugin_type, language,
+            target=target, **data))
+        return plugins[-1]
+
+    try:
+        while True:
+            container = add('RdGridContainerPlugin', gutter='md')
+            layout = add('RdGridLayoutPlugin', container)
+            for i in range(4):
+                cell = add('RdGridCellPlugin', layout, xs_size='12',
+                    md_size='6', md_offset=str(i % 2))
+                if i % 2:
+                    box = add('RdBoxPlugin', cell, boxtitle='box & <b>')
+                    add('RdIconPlugin', box, icon='home', size='small')
+                else:
+                    add('RdIconPlugin', cell, icon='mail', color='red',
+                        additional_classes='ml-2')
+            group = add('RdTabGroupPlugin', container)
+            for i in range(2):
+                tab = add('RdTabPlugin', group, tabtitle='tab "{}"'.format(i))
+                add('RdIconPlugin', tab, icon='star')
+    except _Full:
+        pass
+    return plugins
+
+def generate_placeholder(depth=3, fanout=3, seed=0):
+    """
+    returns a placeholder with a random tree of the benchmark generator
+    """
+    placeholder = Placeholder.objects.create(slot='test')
+    TreeGenerator(depth=depth, fanout=fanout, seed=seed).generate(placeholder)
+    return placeholder
+
+def render(placeholder):
+    """
+    renders a placeholder as a cms page does
+    """
+    return render_placeholder(placeholder, make_request())
+
+def add_tab_group(placeholder, tabs=3, deferred=False, language='en'):
+    """
+    adds a group of tabs, each holding a grid of two cells with an icon;
+    returns the group and the tabs
+    """
+    group = add_plugin(placeholder, 'RdTabGroupPlugin', language,
+        deferred=deferred)
+    added = []
+    for i in range(tabs):
+        tab = add_plugin(placeholder, 'RdTabPlugin', language,
+            target=group, tabtitle='tab {}'.format(i))
+        container = add_plugin(placeholder, 'RdGridContainerPlugin',
+            language, target=tab)
+        layout = add_plugin(placeholder, 'RdGridLayoutPlugin', language,
+            target=container)
+        for size in ('4', '8'):
+            cell = add_plugin(placeholder, 'RdGridCellPlugin', language,
+                target=layout, md_size=size)
+            add_plugin(placeholder, 'RdIconPlugin', language,
+                target=cell, icon='tab{}'.format(i))
+        added.append(tab)
+    return group, added
+
+def serve_site():
+    """
+    makes the pages requested on the domain of the site reach the test
+    server
+    """
+    from django.contrib.sites.models import Site
+    Site.objects.update(domain='testserver')
+    Site.objects.clear_cache()
+
+def publish_page(title, size=8, language='en'):
+    """
+    returns a published page of the test template whose content placeholder
+    holds size plugins of fill_placeholder
+    """
+    page = create_page(title, 'tests/page.html', language)
+    placeholder = page.placeholders.get(slot='content')
+    fill_placeholder(placeholder, size, language)
+    page.publish(language)
+    return page.reload().publisher_public